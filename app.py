@@ -1,101 +1,84 @@
 import os
+import asyncio
+import hashlib
+import json
 import streamlit as st
 from dotenv import load_dotenv
-from tempfile import NamedTemporaryFile
 from pathlib import Path
 
-# Project modules
-from cv_parser.cv_reader import read_cv
-from cv_parser.cv_structurer import structure_cv
-from cv_parser.cv_embedder import chunk_cv, embed_cv
-from job_scraper.linkedin_scraper import fetch_linkedin_job_enhanced  # Updated import
-from job_scraper.job_parser import parse_job_description
-from job_scraper.recruiter_scraper import fetch_recruiter_info_sync, format_company_info_as_markdown
-from job_scraper.linkedin_profile_scraper import fetch_linkedin_profile_sync, format_linkedin_profile_as_markdown  # NEW: Enhanced profile scraper
-from job_scraper.recruiter_parser import parse_recruiter_profile, format_recruiter_summary, enhance_recruiter_data_with_insights  # Use existing parser
+# Try to import orjson for faster JSON rendering, fallback to the stdlib
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-from matching_engine.matcher import match_cv_to_job
-from matching_engine.prompt_generator import generate_cover_letter, generate_message
+# Project modules - scraper, parser and LLM modules are imported where they are used
+# so the first page render does not pay for crawl4ai/playwright/langchain imports
 
 # Load environment variables
 load_dotenv()
 API_KEY = os.getenv("OPENAI_API_KEY")
 
+# Display labels for the scraping method reported by each scraper
+JOB_METHOD_LABELS = {
+    'unauthenticated_direct': '🔓 Direct Scraping',
+    'api_job_api': '🔌 API Endpoint',
+    'manual_input': '✋ Manual Input'
+}
+JOB_SOURCE_DESCRIPTIONS = {
+    'unauthenticated_direct': '🔓 Direct scraping without authentication',
+    'api_job_api': '🔌 LinkedIn public API endpoint',
+    'manual_input': '✋ Manual input provided by user'
+}
+RECRUITER_METHOD_LABELS = {
+    'enhanced_selectolax': '🔍 Selectolax Extraction',
+    'enhanced_beautifulsoup': '🔍 BeautifulSoup Extraction',
+    'crawl4ai_with_markdown': '🤖 Crawl4AI + Markdown',
+    'manual_input': '✋ Manual Input'
+}
+
+CSS_PATH = Path(__file__).parent / "assets" / "style.css"
+
+@st.cache_resource
+def read_css():
+    """Read the stylesheet once per server process"""
+    return f"<style>{CSS_PATH.read_text()}</style>"
+
 def load_css():
     """Load custom CSS for professional styling"""
-    css_file = Path("assets/style.css")
-    if css_file.exists():
-        with open(css_file) as f:
-            st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
-    else:
-        # Fallback inline CSS if file doesn't exist
-        st.markdown("""
-        <style>
-        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap');
-        
-        :root {
-            --primary-color: #2563eb;
-            --primary-dark: #1d4ed8;
-            --success-color: #10b981;
-            --warning-color: #f59e0b;
-            --error-color: #ef4444;
-            --background-color: #f8fafc;
-            --surface-color: #ffffff;
-            --text-primary: #1e293b;
-            --border-radius: 12px;
-            --shadow-md: 0 4px 6px -1px rgb(0 0 0 / 0.1);
-        }
-        
-        * { font-family: 'Inter', sans-serif; }
-        
-        .main .block-container {
-            max-width: 1400px;
-            padding: 2rem 1rem;
-            background: linear-gradient(135deg, var(--background-color) 0%, #ffffff 100%);
-        }
-        
-        .stButton > button {
-            background: linear-gradient(135deg, var(--primary-color), var(--primary-dark));
-            color: white;
-            border: none;
-            border-radius: var(--border-radius);
-            padding: 0.75rem 1.5rem;
-            font-weight: 500;
-            transition: all 0.3s ease;
-            width: 100%;
-        }
-        
-        .stButton > button:hover {
-            transform: translateY(-2px);
-            box-shadow: var(--shadow-md);
-        }
-        </style>
-        """, unsafe_allow_html=True)
+    st.markdown(read_css(), unsafe_allow_html=True)
+
+# Session-state keys and their initial values
+DEFAULT_STATES = {
+    'cv_struct': None,
+    'job_struct': None,
+    'company_info': None,
+    'recruiter_profile': None,
+    'recruiter_struct': None,  # NEW: Structured recruiter data
+    'company_info_md': None,  # Formatted once at scrape time
+    'recruiter_profile_md': None,
+    'recruiter_summary_md': None,
+    'match_results': None,
+    'match_summary_md': None,
+    'cover_letter': None,
+    'recruiter_message': None,
+    'job_manual_required': False,
+    'company_manual_required': False,
+    'recruiter_manual_required': False,
+    'manual_job_text': None,
+    'manual_company_text': None,
+    'manual_recruiter_text': None,
+    'analysis_step': 'upload',  # Track current step
+    'scraping_method': None,  # Track which scraping method was used
+    'last_analysis_sig': None  # Input hash of the last successful analysis
+}
 
 def init_session_state():
     """Initialize all session state variables"""
-    default_states = {
-        'cv_struct': None,
-        'job_struct': None,
-        'company_info': None,
-        'recruiter_profile': None,
-        'recruiter_struct': None,  # NEW: Structured recruiter data
-        'match_results': None,
-        'cover_letter': None,
-        'recruiter_message': None,
-        'job_manual_required': False,
-        'company_manual_required': False,
-        'recruiter_manual_required': False,
-        'manual_job_text': None,
-        'manual_company_text': None,
-        'manual_recruiter_text': None,
-        'analysis_step': 'upload',  # Track current step
-        'scraping_method': None  # Track which scraping method was used
-    }
-    
-    for key, default_value in default_states.items():
-        if key not in st.session_state:
-            st.session_state[key] = default_value
+    ss = st.session_state
+    for key, default_value in DEFAULT_STATES.items():
+        ss.setdefault(key, default_value)
 
 def render_header():
     """Render the application header"""
@@ -114,28 +97,29 @@ def render_header():
 
 def render_progress_indicator():
     """Render progress indicator based on current step"""
+    ss = st.session_state
     steps = [
-        ("📄", "Upload CV", st.session_state.cv_struct is not None),
-        ("🔍", "Job Analysis", st.session_state.job_struct is not None),
-        ("🏢", "Company Info", st.session_state.company_info is not None or not st.session_state.get('company_url')),
-        ("👤", "Recruiter", st.session_state.recruiter_struct is not None or not st.session_state.get('recruiter_url')),
-        ("📊", "Matching", st.session_state.match_results is not None),
-        ("✉️", "Generate", st.session_state.cover_letter is not None or st.session_state.recruiter_message is not None)
+        ("📄", "Upload CV", ss.cv_struct is not None),
+        ("🔍", "Job Analysis", ss.job_struct is not None),
+        ("🏢", "Company Info", ss.company_info is not None or not ss.get('company_url')),
+        ("👤", "Recruiter", ss.recruiter_struct is not None or not ss.get('recruiter_url')),
+        ("📊", "Matching", ss.match_results is not None),
+        ("✉️", "Generate", ss.cover_letter is not None or ss.recruiter_message is not None)
     ]
     
-    cols = st.columns(len(steps))
-    for i, (icon, label, completed) in enumerate(steps):
-        with cols[i]:
-            status_class = "✅" if completed else "⏳"
-            st.markdown(f"""
-            <div style="text-align: center; padding: 1rem; 
-                        background: {'#f0f9ff' if completed else '#f8fafc'}; 
-                        border-radius: 8px; margin-bottom: 1rem;">
-                <div style="font-size: 1.5rem;">{icon}</div>
-                <div style="font-size: 0.85rem; font-weight: 500; color: #64748b;">{label}</div>
-                <div style="font-size: 1rem;">{status_class}</div>
-            </div>
-            """, unsafe_allow_html=True)
+    # One flex row in a single markdown call instead of one st.columns cell per step
+    cells = "".join(f"""
+        <div style="flex: 1; text-align: center; padding: 1rem; 
+                    background: {'#f0f9ff' if completed else '#f8fafc'}; 
+                    border-radius: 8px;">
+            <div style="font-size: 1.5rem;">{icon}</div>
+            <div style="font-size: 0.85rem; font-weight: 500; color: #64748b;">{label}</div>
+            <div style="font-size: 1rem;">{"✅" if completed else "⏳"}</div>
+        </div>""" for icon, label, completed in steps)
+    st.markdown(f"""
+    <div style="display: flex; gap: 1rem; margin-bottom: 1rem;">{cells}
+    </div>
+    """, unsafe_allow_html=True)
 
 def render_input_section():
     """Render the input section with improved UX"""
@@ -191,75 +175,170 @@ def render_input_section():
         
         return cv_file, job_url, company_url, recruiter_url
 
+def render_manual_input(kind, title, warning, label, placeholder, button_label, height=150, expanded=False, empty_error=None):
+    """Render one manual input fallback block if scraping for `kind` failed"""
+    if not st.session_state.get(f'{kind}_manual_required', False):
+        return
+    
+    with st.expander(title, expanded=expanded):
+        st.warning(warning)
+        manual_text = st.text_area(
+            label, 
+            height=height, 
+            key=f"manual_{kind}_input",
+            placeholder=placeholder
+        )
+        if st.button(button_label, key=f"parse_{kind}"):
+            if manual_text.strip():
+                st.session_state[f'manual_{kind}_text'] = manual_text
+                st.session_state[f'{kind}_manual_required'] = False
+                st.rerun()
+            elif empty_error:
+                st.error(empty_error)
+
 def render_manual_input_sections():
     """Render manual input sections when scraping fails"""
-    if st.session_state.get('job_manual_required', False):
-        with st.expander("⚠️ Manual Job Description Required", expanded=True):
-            st.warning("Enhanced job scraping failed after trying multiple methods. Please paste the job description manually:")
-            manual_job_text = st.text_area(
-                "Job Description", 
-                height=200, 
-                key="manual_job_input",
-                placeholder="Paste the complete job description here..."
-            )
-            if st.button("Parse Job Description", key="parse_job"):
-                if manual_job_text.strip():
-                    st.session_state.manual_job_text = manual_job_text
-                    st.session_state.job_manual_required = False
-                    st.rerun()
-                else:
-                    st.error("Please enter a job description")
-    
-    if st.session_state.get('company_manual_required', False):
-        with st.expander("⚠️ Manual Company Information", expanded=False):
-            st.warning("Company scraping failed. You can provide company information manually:")
-            manual_company_text = st.text_area(
-                "Company Information", 
-                height=150, 
-                key="manual_company_input",
-                placeholder="Paste company description, size, industry, etc."
-            )
-            if st.button("Parse Company Information", key="parse_company"):
-                if manual_company_text.strip():
-                    st.session_state.manual_company_text = manual_company_text
-                    st.session_state.company_manual_required = False
-                    st.rerun()
-    
-    if st.session_state.get('recruiter_manual_required', False):
-        with st.expander("⚠️ Manual Recruiter Profile", expanded=False):
-            st.warning("Recruiter profile scraping failed. You can provide recruiter information manually:")
-            manual_recruiter_text = st.text_area(
-                "Recruiter Profile Information", 
-                height=150, 
-                key="manual_recruiter_input",
-                placeholder="Paste recruiter's name, position, background, specializations..."
-            )
-            if st.button("Parse Recruiter Profile", key="parse_recruiter"):
-                if manual_recruiter_text.strip():
-                    st.session_state.manual_recruiter_text = manual_recruiter_text
-                    st.session_state.recruiter_manual_required = False
-                    st.rerun()
-
-def process_cv(cv_file):
-    """Process CV file and return structured data"""
+    render_manual_input(
+        "job", "⚠️ Manual Job Description Required",
+        "Enhanced job scraping failed after trying multiple methods. Please paste the job description manually:",
+        "Job Description", "Paste the complete job description here...", "Parse Job Description",
+        height=200, expanded=True, empty_error="Please enter a job description"
+    )
+    render_manual_input(
+        "company", "⚠️ Manual Company Information",
+        "Company scraping failed. You can provide company information manually:",
+        "Company Information", "Paste company description, size, industry, etc.", "Parse Company Information"
+    )
+    render_manual_input(
+        "recruiter", "⚠️ Manual Recruiter Profile",
+        "Recruiter profile scraping failed. You can provide recruiter information manually:",
+        "Recruiter Profile Information", "Paste recruiter's name, position, background, specializations...", "Parse Recruiter Profile"
+    )
+
+class _FailedResult(Exception):
+    """Carries a failed result out of a cached function so it is never memoized"""
+    def __init__(self, result):
+        super().__init__(result.get('error'))
+        self.result = result
+
+def _raise_on_error(result):
+    if result.get('error'):
+        raise _FailedResult(result)
+    return result
+
+def api_key_marker(api_key):
+    """Short fingerprint of the API key, so cache entries change with the key without storing it"""
+    return hashlib.sha256(api_key.encode()).hexdigest()[:8] if api_key else "none"
+
+# Persisted to disk so a structured CV survives app restarts.
+# The raw key stays unhashed (leading underscore); key_marker puts a fingerprint of it in the cache key,
+# so a regex-fallback result cached without a key is not served once a real key is configured.
+@st.cache_data(persist="disk", show_spinner=False, max_entries=256)
+def _cached_read_and_structure(cv_bytes, suffix, key_marker, _api_key):
+    """Read and structure CV bytes - cached on content so identical uploads skip the LLM call"""
+    from cv_parser.cv_reader import read_cv
+    from cv_parser.cv_structurer import structure_cv
+    
+    # Read straight from memory - only the extension is needed to pick a reader
+    cv_text = read_cv(f"cv{suffix}", data=cv_bytes)
+    return _raise_on_error(structure_cv(cv_text, api_key=_api_key))
+
+def process_cv(cv_raw):
+    """Return the structured CV produced by the pipeline, reporting any failure"""
     try:
-        file_name = cv_file.name
-        with NamedTemporaryFile(suffix=file_name) as tmp:
-            tmp.write(cv_file.getbuffer())
-            tmp.flush()
-            cv_text = read_cv(tmp.name)
-        return structure_cv(cv_text, api_key=API_KEY)
+        if isinstance(cv_raw, Exception):
+            raise cv_raw
+        return cv_raw
     except Exception as e:
         st.error(f"Error processing CV: {str(e)}")
         return None
 
-def process_job(job_url):
-    """Process job URL using enhanced scraping and return structured data"""
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def _cached_fetch_job(job_url, manual_job_text):
+    from job_scraper.linkedin_scraper import fetch_linkedin_job_enhanced
+    return _raise_on_error(fetch_linkedin_job_enhanced(job_url, manual_job_text))
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def _cached_fetch_company(company_url, manual_company_text):
+    from job_scraper.recruiter_scraper import fetch_recruiter_info_sync
+    return _raise_on_error(fetch_recruiter_info_sync(company_url, manual_company_text))
+
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def _cached_fetch_recruiter(recruiter_url, manual_recruiter_text):
+    from job_scraper.linkedin_profile_scraper import fetch_linkedin_profile_sync
+    return _raise_on_error(fetch_linkedin_profile_sync(recruiter_url, manual_recruiter_text))
+
+# Parsed job and recruiter structs are persisted keyed on the scraped markdown
+@st.cache_data(persist="disk", show_spinner=False, max_entries=256)
+def _cached_parse_job(job_markdown):
+    from job_scraper.job_parser import parse_job_description
+    return _raise_on_error(parse_job_description(job_markdown))
+
+@st.cache_data(persist="disk", show_spinner=False, max_entries=256)
+def _cached_parse_recruiter(recruiter_markdown):
+    from job_scraper.recruiter_parser import parse_recruiter_profile
+    return _raise_on_error(parse_recruiter_profile(recruiter_markdown))
+
+# Exact-match cache for the batched generation; the Generate buttons always call the LLM afresh
+@st.cache_data(ttl=3600, max_entries=64, show_spinner=False)
+def _cached_generate_all(cv_struct, job_struct, company_context, recruiter_context):
+    from matching_engine.batch import generate_all
+    results = generate_all(cv_struct, job_struct, company_context=company_context, recruiter_context=recruiter_context)
+    if results['match'].get('error') or results.get('error'):
+        raise _FailedResult(results)
+    return results
+
+def _fetch(cached_fetch, *args):
+    """Call a cached step; failed results are returned but not cached so the next run retries"""
     try:
-        manual_job_text = st.session_state.get('manual_job_text', None)
-        
-        # Use the enhanced LinkedIn scraper
-        job_raw = fetch_linkedin_job_enhanced(job_url, manual_job_text)
+        return cached_fetch(*args)
+    except _FailedResult as e:
+        return e.result
+
+async def _none():
+    return None
+
+def _fetch_and_parse(cached_fetch, cached_parse, url, manual_text):
+    """
+    Scrape a page and, as soon as its markdown is available, parse it on the same worker thread.
+    Returns (raw, parsed); a parsing exception is returned in place of the parsed result.
+    """
+    raw = _fetch(cached_fetch, url, manual_text)
+    parsed = None
+    if raw.get('markdown') and not raw.get('error'):
+        try:
+            parsed = _fetch(cached_parse, raw['markdown'])
+        except Exception as e:
+            parsed = e
+    return raw, parsed
+
+async def run_pipeline(cv_file, job_url, company_url, recruiter_url):
+    """
+    Structure the CV and scrape the job, company and recruiter pages concurrently.
+    Job and recruiter pages are parsed by the LLM straight after their own scrape finishes.
+    Each cached step runs on a worker thread; exceptions are returned in place of results.
+    """
+    suffix = os.path.splitext(cv_file.name)[1].lower()
+    return await asyncio.gather(
+        asyncio.to_thread(_fetch, _cached_read_and_structure, cv_file.getvalue(), suffix, api_key_marker(API_KEY), API_KEY),
+        asyncio.to_thread(_fetch_and_parse, _cached_fetch_job, _cached_parse_job, job_url, st.session_state.get('manual_job_text')),
+        asyncio.to_thread(_fetch, _cached_fetch_company, company_url, st.session_state.get('manual_company_text')) if company_url else _none(),
+        asyncio.to_thread(_fetch_and_parse, _cached_fetch_recruiter, _cached_parse_recruiter, recruiter_url, st.session_state.get('manual_recruiter_text')) if recruiter_url else _none(),
+        return_exceptions=True
+    )
+
+def _split_parsed(result):
+    """Split a (raw, parsed) pipeline result; exceptions and None pass through with no parse"""
+    if isinstance(result, tuple):
+        return result
+    return result, None
+
+def process_job(job_raw, job_parsed=None):
+    """Turn the scraped job posting into structured data.
+    `job_parsed` is the parse already produced by the pipeline, if any."""
+    try:
+        if isinstance(job_raw, Exception):
+            raise job_raw
         
         # Handle the enhanced scraper's response format
         if job_raw.get('error') == 'MANUAL_INPUT_REQUIRED':
@@ -278,15 +357,13 @@ def process_job(job_url):
         # Track which scraping method was successful
         if job_raw.get('method'):
             st.session_state.scraping_method = job_raw['method']
-            method_display = {
-                'unauthenticated_direct': '🔓 Direct Scraping',
-                'api_job_api': '🔌 API Endpoint',
-                'manual_input': '✋ Manual Input'
-            }.get(job_raw['method'], f"📡 {job_raw['method']}")
+            method_display = JOB_METHOD_LABELS.get(job_raw['method'], f"📡 {job_raw['method']}")
             
             st.success(f"Job data retrieved via: {method_display}")
         
-        return parse_job_description(job_raw["markdown"])
+        if isinstance(job_parsed, Exception):
+            raise job_parsed
+        return job_parsed or _fetch(_cached_parse_job, job_raw["markdown"])
         
     except Exception as e:
         st.error(f"Error processing job: {str(e)}")
@@ -294,14 +371,14 @@ def process_job(job_url):
         st.session_state.job_manual_required = True
         return None
 
-def process_company(company_url):
-    """Process company URL and return data"""
-    if not company_url:
+def process_company(company_raw):
+    """Check the scraped company data and return it"""
+    if company_raw is None:
         return None
         
     try:
-        manual_company_text = st.session_state.get('manual_company_text', None)
-        company_raw = fetch_recruiter_info_sync(company_url, manual_company_text)
+        if isinstance(company_raw, Exception):
+            raise company_raw
         
         if company_raw.get('error') == 'MANUAL_INPUT_REQUIRED':
             st.session_state.company_manual_required = True
@@ -313,16 +390,15 @@ def process_company(company_url):
         st.warning(f"Error processing company: {str(e)}")
         return None
 
-def process_recruiter(recruiter_url):
-    """Process recruiter URL using enhanced LinkedIn profile scraper and return structured data"""
-    if not recruiter_url:
+def process_recruiter(recruiter_raw, recruiter_parsed=None):
+    """Parse the scraped recruiter profile and return raw and structured data.
+    `recruiter_parsed` is the parse already produced by the pipeline, if any."""
+    if recruiter_raw is None:
         return None, None
         
     try:
-        manual_recruiter_text = st.session_state.get('manual_recruiter_text', None)
-        
-        # Use the new enhanced LinkedIn profile scraper
-        recruiter_raw = fetch_linkedin_profile_sync(recruiter_url, manual_recruiter_text)
+        if isinstance(recruiter_raw, Exception):
+            raise recruiter_raw
         
         if recruiter_raw.get('error') == 'MANUAL_INPUT_REQUIRED':
             st.session_state.recruiter_manual_required = True
@@ -337,8 +413,12 @@ def process_recruiter(recruiter_url):
         recruiter_struct = None
         if recruiter_raw.get('markdown'):
             try:
-                # Use the existing recruiter parser
-                recruiter_struct = parse_recruiter_profile(recruiter_raw['markdown'])
+                from job_scraper.recruiter_parser import enhance_recruiter_data_with_insights
+                
+                # Use the parse produced alongside the scrape, or run the existing recruiter parser
+                if isinstance(recruiter_parsed, Exception):
+                    raise recruiter_parsed
+                recruiter_struct = recruiter_parsed or _fetch(_cached_parse_recruiter, recruiter_raw['markdown'])
                 
                 # Check if parsing was successful
                 if recruiter_struct.get('error'):
@@ -355,11 +435,7 @@ def process_recruiter(recruiter_url):
                     # Success message showing what was extracted
                     name = recruiter_struct.get('recruiter_name', 'Recruiter')
                     position = recruiter_struct.get('current_position', 'Unknown position')
-                    method_display = {
-                        'enhanced_beautifulsoup': '🔍 BeautifulSoup Extraction',
-                        'crawl4ai_with_markdown': '🤖 Crawl4AI + Markdown',
-                        'manual_input': '✋ Manual Input'
-                    }.get(recruiter_raw.get('extraction_method', ''), '📡 Enhanced Scraping')
+                    method_display = RECRUITER_METHOD_LABELS.get(recruiter_raw.get('extraction_method', ''), '📡 Enhanced Scraping')
                     
                     st.success(f"✅ Profile scraped via: {method_display}")
                     st.info(f"👤 Parsed: {name} - {position}")
@@ -374,20 +450,27 @@ def process_recruiter(recruiter_url):
         st.warning(f"Error processing recruiter: {str(e)}")
         return None, None
 
+@st.cache_data(show_spinner=False, max_entries=32)
+def pretty_json(obj):
+    """Pretty-print a struct once - st.code renders far cheaper than the interactive st.json tree"""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2, ensure_ascii=False, default=str)
+
 def render_results():
     """Render analysis results in an organized way"""
-    if not (st.session_state.cv_struct and st.session_state.job_struct):
+    ss = st.session_state
+    if not (ss.cv_struct and ss.job_struct):
         return
     
     st.markdown("## 📊 Analysis Results")
     
     # Show scraping method used if available
-    if st.session_state.get('scraping_method'):
-        method_info = {
-            'unauthenticated_direct': '🔓 Direct scraping without authentication',
-            'api_job_api': '🔌 LinkedIn public API endpoint',
-            'manual_input': '✋ Manual input provided by user'
-        }.get(st.session_state.scraping_method, f"📡 {st.session_state.scraping_method}")
+    if ss.get('scraping_method'):
+        method_info = JOB_SOURCE_DESCRIPTIONS.get(ss.scraping_method, f"📡 {ss.scraping_method}")
         
         st.info(f"**Job Data Source:** {method_info}")
     
@@ -396,70 +479,96 @@ def render_results():
     
     with tab1:
         st.markdown("### Parsed CV Structure")
-        if st.session_state.cv_struct:
-            st.json(st.session_state.cv_struct, expanded=False)
+        if ss.cv_struct:
+            st.code(pretty_json(ss.cv_struct), language="json")
         else:
             st.info("No CV data available")
     
     with tab2:
         st.markdown("### Job Requirements")
-        if st.session_state.job_struct:
-            st.json(st.session_state.job_struct, expanded=False)
+        if ss.job_struct:
+            st.code(pretty_json(ss.job_struct), language="json")
         else:
             st.info("No job data available")
     
     with tab3:
         st.markdown("### Company Information")
-        if st.session_state.company_info:
-            if st.session_state.company_info.get('error') and st.session_state.company_info.get('error') != 'MANUAL_INPUT_REQUIRED':
-                st.error(f"Error: {st.session_state.company_info['error']}")
+        if ss.company_info:
+            if ss.company_info.get('error') and ss.company_info.get('error') != 'MANUAL_INPUT_REQUIRED':
+                st.error(f"Error: {ss.company_info['error']}")
             else:
-                formatted_company_info = format_company_info_as_markdown(st.session_state.company_info)
-                st.markdown(formatted_company_info)
+                st.markdown(ss.company_info_md)
         else:
             st.info("No company information provided")
     
     with tab4:
         st.markdown("### Recruiter Profile")
-        if st.session_state.recruiter_struct:
+        if ss.recruiter_struct:
             # Display structured recruiter data similar to CV/Job
             st.markdown("#### Structured Recruiter Data")
-            st.json(st.session_state.recruiter_struct, expanded=False)
+            st.code(pretty_json(ss.recruiter_struct), language="json")
             
             # Also show a formatted summary
-            if st.session_state.recruiter_struct.get('recruiter_name'):
-                summary = format_recruiter_summary(st.session_state.recruiter_struct)
+            if ss.recruiter_struct.get('recruiter_name'):
                 with st.expander("📋 Recruiter Summary", expanded=True):
-                    st.markdown(summary)
+                    st.markdown(ss.recruiter_summary_md)
         
-        elif st.session_state.recruiter_profile:
-            if st.session_state.recruiter_profile.get('error') and st.session_state.recruiter_profile.get('error') != 'MANUAL_INPUT_REQUIRED':
-                st.error(f"Error: {st.session_state.recruiter_profile['error']}")
+        elif ss.recruiter_profile:
+            if ss.recruiter_profile.get('error') and ss.recruiter_profile.get('error') != 'MANUAL_INPUT_REQUIRED':
+                st.error(f"Error: {ss.recruiter_profile['error']}")
             else:
                 # Show raw scraped data if structured parsing failed
                 st.markdown("#### Raw Scraped Data")
-                formatted_recruiter_info = format_linkedin_profile_as_markdown(st.session_state.recruiter_profile)
-                st.markdown(formatted_recruiter_info)
+                st.markdown(ss.recruiter_profile_md)
                 
                 # Show basic extracted data
-                if not st.session_state.recruiter_profile.get('error'):
+                if not ss.recruiter_profile.get('error'):
                     with st.expander("📊 Basic Extracted Data", expanded=False):
-                        display_data = {k: v for k, v in st.session_state.recruiter_profile.items() 
+                        display_data = {k: v for k, v in ss.recruiter_profile.items() 
                                       if k not in ['markdown', 'metadata']}
-                        st.json(display_data, expanded=False)
+                        st.code(pretty_json(display_data), language="json")
         else:
             st.info("No recruiter profile provided")
     
     with tab5:
         st.markdown("### Match Analysis")
-        if st.session_state.match_results:
-            st.json(st.session_state.match_results, expanded=True)
+        if ss.match_results:
+            st.markdown(ss.match_summary_md)
+            with st.expander("Full match JSON", expanded=False):
+                st.json(ss.match_results, expanded=False)
         else:
             st.info("Run analysis to see match results")
 
+def build_message_context():
+    """Build the company and recruiter context strings used for communications"""
+    company_context = ""
+    if st.session_state.company_info and not st.session_state.company_info.get('error'):
+        company_context = st.session_state.company_info_md
+    
+    # Use the structured recruiter data if available, otherwise fallback to raw data
+    recruiter_context = ""
+    if st.session_state.recruiter_struct:
+        recruiter_context = st.session_state.recruiter_summary_md
+    elif (st.session_state.recruiter_profile and 
+          not st.session_state.recruiter_profile.get('error')):
+        recruiter_context = st.session_state.recruiter_profile_md
+    
+    return company_context, recruiter_context
+
+def stream_to_placeholder(chunks):
+    """Render streamed LLM text as it arrives and return the full text"""
+    placeholder = st.empty()
+    with placeholder.container():
+        text = st.write_stream(chunks)
+    placeholder.empty()
+    return text.strip()
+
+# Fragment: the Generate buttons rerun only this section, not the whole page
+@st.fragment
 def render_communication_section():
     """Render communication generation section with enhanced recruiter context"""
-    if not (st.session_state.cv_struct and st.session_state.job_struct):
+    ss = st.session_state
+    if not (ss.cv_struct and ss.job_struct):
         return
     
     st.markdown("## ✉️ Generate Professional Communications")
@@ -469,22 +578,23 @@ def render_communication_section():
     with col1:
         st.markdown("### 📝 Cover Letter")
         if st.button("Generate Cover Letter", key="generate_cover", type="primary"):
+            from matching_engine.prompt_generator import stream_cover_letter
             with st.spinner("Crafting your cover letter..."):
-                st.session_state.cover_letter = generate_cover_letter(
-                    st.session_state.cv_struct, 
-                    st.session_state.job_struct
-                )
+                ss.cover_letter = stream_to_placeholder(stream_cover_letter(
+                    ss.cv_struct, 
+                    ss.job_struct
+                ))
         
-        if st.session_state.cover_letter:
+        if ss.cover_letter:
             st.text_area(
                 "Cover Letter", 
-                st.session_state.cover_letter, 
+                ss.cover_letter, 
                 height=300, 
                 key="cover_display"
             )
             st.download_button(
                 "📥 Download Cover Letter", 
-                data=st.session_state.cover_letter, 
+                data=ss.cover_letter, 
                 file_name="cover_letter.txt",
                 key="download_cover",
                 type="secondary"
@@ -494,56 +604,138 @@ def render_communication_section():
         st.markdown("### 💬 Recruiter Message")
         
         # Show personalization preview if structured recruiter data is available
-        if st.session_state.recruiter_struct:
-            name = st.session_state.recruiter_struct.get('recruiter_name', 'Recruiter')
-            position = st.session_state.recruiter_struct.get('current_position', 'Unknown')
+        if ss.recruiter_struct:
+            name = ss.recruiter_struct.get('recruiter_name', 'Recruiter')
+            position = ss.recruiter_struct.get('current_position', 'Unknown')
             
             st.info(f"📋 Will personalize for: **{name}** ({position})")
             
             # Show key personalization hooks if available
-            if st.session_state.recruiter_struct.get('personalization_insights'):
-                insights = st.session_state.recruiter_struct['personalization_insights']
+            if ss.recruiter_struct.get('personalization_insights'):
+                insights = ss.recruiter_struct['personalization_insights']
                 hooks = insights.get('personalization_hooks', [])
                 if hooks:
                     st.caption(f"🎯 Hooks: {', '.join(hooks[:2])}")
         
         if st.button("Generate Recruiter Message", key="generate_message", type="primary"):
+            from matching_engine.prompt_generator import stream_message
             with st.spinner("Crafting personalized recruiter message..."):
                 # Enhanced context using structured recruiter data
-                company_context = ""
-                if st.session_state.company_info and not st.session_state.company_info.get('error'):
-                    company_context = format_company_info_as_markdown(st.session_state.company_info)
-                
-                # Use the structured recruiter data if available, otherwise fallback to raw data
-                recruiter_context = ""
-                if st.session_state.recruiter_struct:
-                    recruiter_context = format_recruiter_summary(st.session_state.recruiter_struct)
-                elif (st.session_state.recruiter_profile and 
-                      not st.session_state.recruiter_profile.get('error')):
-                    recruiter_context = format_linkedin_profile_as_markdown(st.session_state.recruiter_profile)
+                company_context, recruiter_context = build_message_context()
                 
-                st.session_state.recruiter_message = generate_message(
-                    st.session_state.cv_struct, 
-                    st.session_state.job_struct, 
+                ss.recruiter_message = stream_to_placeholder(stream_message(
+                    ss.cv_struct, 
+                    ss.job_struct, 
                     company_context=company_context,
                     recruiter_context=recruiter_context
-                )
+                ))
         
-        if st.session_state.recruiter_message:
+        if ss.recruiter_message:
             st.text_area(
                 "Recruiter Message", 
-                st.session_state.recruiter_message, 
+                ss.recruiter_message, 
                 height=300, 
                 key="message_display"
             )
             st.download_button(
                 "📥 Download Message", 
-                data=st.session_state.recruiter_message, 
+                data=ss.recruiter_message, 
                 file_name="recruiter_message.txt",
                 key="download_message",
                 type="secondary"
             )
 
+def compute_analysis_signature(cv_file, job_url, company_url, recruiter_url):
+    """Hash every input of an analysis run so unchanged inputs can skip the pipeline"""
+    digest = hashlib.blake2b(cv_file.getvalue(), digest_size=16)
+    for value in (job_url, company_url, recruiter_url,
+                  st.session_state.get('manual_job_text'),
+                  st.session_state.get('manual_company_text'),
+                  st.session_state.get('manual_recruiter_text')):
+        digest.update(b"\0" + (value or "").encode())
+    return digest.hexdigest()
+
+def run_analysis(cv_file, job_url, company_url, recruiter_url):
+    """Run the full CV, scraping, matching and generation pipeline.
+    Returns True only if every requested step succeeded, so a partial run can be retried."""
+    from job_scraper.recruiter_scraper import format_company_info_as_markdown
+    from job_scraper.linkedin_profile_scraper import format_linkedin_profile_as_markdown
+    from job_scraper.recruiter_parser import format_recruiter_summary
+    from matching_engine.matcher import format_match_summary
+    
+    # Clear previous results
+    for key in ['cv_struct', 'job_struct', 'company_info', 'company_info_md', 'recruiter_profile', 'recruiter_profile_md', 'recruiter_summary_md', 'recruiter_struct', 'match_results', 'match_summary_md', 'cover_letter', 'recruiter_message', 'scraping_method', 'last_analysis_sig']:
+        st.session_state[key] = None
+    
+    # Process each component
+    progress_bar = st.progress(0)
+    
+    # CV Processing, LinkedIn scraping and job/recruiter parsing run concurrently
+    with st.spinner("📄 Processing CV and scraping LinkedIn pages..."):
+        cv_raw, job_result, company_raw, recruiter_result = asyncio.run(
+            run_pipeline(cv_file, job_url, company_url, recruiter_url)
+        )
+        job_raw, job_parsed = _split_parsed(job_result)
+        recruiter_raw, recruiter_parsed = _split_parsed(recruiter_result)
+        st.session_state.cv_struct = process_cv(cv_raw)
+        progress_bar.progress(40)
+    
+    if not st.session_state.cv_struct:
+        st.stop()
+    
+    # Enhanced Job Processing
+    with st.spinner("💼 Analyzing job posting..."):
+        st.session_state.job_struct = process_job(job_raw, job_parsed)
+        progress_bar.progress(55)
+    
+    if not st.session_state.job_struct:
+        st.stop()
+    
+    # Company Processing
+    if company_url:
+        st.session_state.company_info = process_company(company_raw)
+        if st.session_state.company_info:
+            st.session_state.company_info_md = format_company_info_as_markdown(st.session_state.company_info)
+        progress_bar.progress(65)
+    
+    # Enhanced Recruiter Processing
+    if recruiter_url:
+        with st.spinner("👤 Analyzing recruiter profile..."):
+            recruiter_raw, recruiter_struct = process_recruiter(recruiter_raw, recruiter_parsed)
+            st.session_state.recruiter_profile = recruiter_raw
+            st.session_state.recruiter_struct = recruiter_struct
+            if recruiter_raw:
+                st.session_state.recruiter_profile_md = format_linkedin_profile_as_markdown(recruiter_raw)
+            if recruiter_struct:
+                st.session_state.recruiter_summary_md = format_recruiter_summary(recruiter_struct)
+            progress_bar.progress(80)
+    
+    # Matching + communications in a single batched LLM call
+    with st.spinner("🔍 Calculating match score and drafting communications..."):
+        company_context, recruiter_context = build_message_context()
+        results = _fetch(
+            _cached_generate_all,
+            st.session_state.cv_struct, 
+            st.session_state.job_struct,
+            company_context,
+            recruiter_context
+        )
+        st.session_state.match_results = results['match']
+        st.session_state.match_summary_md = format_match_summary(results['match'])
+        st.session_state.cover_letter = results['cover_letter']
+        st.session_state.recruiter_message = results['message']
+        if results.get('error'):
+            st.warning(f"Drafting communications failed: {results['error'].get('error', 'Unknown error')} - use the Generate buttons to retry.")
+        progress_bar.progress(100)
+    
+    st.success("✅ Enhanced analysis complete!")
+    st.balloons()
+    
+    generation_ok = not (results['match'].get('error') or results.get('error'))
+    company_ok = not company_url or bool(st.session_state.company_info)
+    recruiter_ok = not recruiter_url or bool(st.session_state.recruiter_struct)
+    return generation_ok and company_ok and recruiter_ok
+
 def main():
     """Main application function"""
     # Page config
@@ -580,53 +772,13 @@ def main():
                 st.error("Please upload a CV and enter a LinkedIn job URL.")
                 st.stop()
             
-            # Clear previous results
-            for key in ['cv_struct', 'job_struct', 'company_info', 'recruiter_profile', 'recruiter_struct', 'match_results', 'cover_letter', 'recruiter_message', 'scraping_method']:
-                st.session_state[key] = None
-            
-            # Process each component
-            progress_bar = st.progress(0)
-            
-            # CV Processing
-            with st.spinner("📄 Processing CV..."):
-                st.session_state.cv_struct = process_cv(cv_file)
-                progress_bar.progress(20)
-            
-            if not st.session_state.cv_struct:
-                st.stop()
-            
-            # Enhanced Job Processing
-            with st.spinner("💼 Analyzing job posting with enhanced methods..."):
-                st.session_state.job_struct = process_job(job_url)
-                progress_bar.progress(40)
-            
-            if not st.session_state.job_struct:
-                st.stop()
-            
-            # Company Processing
-            if company_url:
-                with st.spinner("🏢 Gathering company insights..."):
-                    st.session_state.company_info = process_company(company_url)
-                    progress_bar.progress(60)
-            
-            # Enhanced Recruiter Processing
-            if recruiter_url:
-                with st.spinner("👤 Analyzing recruiter profile with enhanced methods..."):
-                    recruiter_raw, recruiter_struct = process_recruiter(recruiter_url)
-                    st.session_state.recruiter_profile = recruiter_raw
-                    st.session_state.recruiter_struct = recruiter_struct
-                    progress_bar.progress(80)
-            
-            # Matching
-            with st.spinner("🔍 Calculating match score..."):
-                st.session_state.match_results = match_cv_to_job(
-                    st.session_state.cv_struct, 
-                    st.session_state.job_struct
-                )
-                progress_bar.progress(100)
-            
-            st.success("✅ Enhanced analysis complete!")
-            st.balloons()
+            analysis_sig = compute_analysis_signature(cv_file, job_url, company_url, recruiter_url)
+            if analysis_sig == st.session_state.last_analysis_sig:
+                st.info("ℹ️ Inputs unchanged since the last analysis - showing previous results.")
+            else:
+                # Failed steps are not cached, so only a complete run may skip the next click
+                if run_analysis(cv_file, job_url, company_url, recruiter_url):
+                    st.session_state.last_analysis_sig = analysis_sig
     
     # Render results and communication sections
     render_results()
@@ -637,8 +789,7 @@ def main():
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
         if st.button("🔄 Reset All Data", key="reset"):
-            for key in list(st.session_state.keys()):
-                del st.session_state[key]
+            st.session_state.clear()
             st.rerun()
 
 if __name__ == "__main__":
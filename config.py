@@ -1,6 +1,12 @@
 # config.py - Updated to remove LinkedIn cookie dependencies
 
+import asyncio
+import json
 import os
+import random
+import threading
+import weakref
+from functools import lru_cache
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -20,12 +26,19 @@ class Settings:
     MAX_RETRY_ATTEMPTS = int(os.getenv("MAX_RETRY_ATTEMPTS", "3"))
     RETRY_DELAY = int(os.getenv("RETRY_DELAY", "5"))
     
+    # Max LLM requests in flight for the async batch helpers (keeps bursts under the provider rate limit)
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "10"))
+    
+    # Job ads are mostly structured already: parse with the fast model, escalate to the strong one only when that fails
+    JOB_PARSER_FAST_MODEL = os.getenv("JOB_PARSER_FAST_MODEL", "gpt-4o-mini")
+    JOB_PARSER_STRONG_MODEL = os.getenv("JOB_PARSER_STRONG_MODEL", "gpt-4.1-mini")
+    
     # Alternative data sources configuration
     ENABLE_ALTERNATIVE_SOURCES = os.getenv("ENABLE_ALTERNATIVE_SOURCES", "true").lower() == "true"
     
     # Proxy settings (optional - for advanced users)
     USE_PROXY = os.getenv("USE_PROXY", "false").lower() == "true"
-    PROXY_LIST = os.getenv("PROXY_LIST", "").split(",") if os.getenv("PROXY_LIST") else []
+    PROXY_LIST = [proxy for proxy in os.getenv("PROXY_LIST", "").split(",") if proxy]
     
     # User agent rotation
     ROTATE_USER_AGENTS = os.getenv("ROTATE_USER_AGENTS", "true").lower() == "true"
@@ -39,31 +52,125 @@ class Settings:
 
 settings = Settings()
 
+# Per-request limits for every chat client - a hung request fails fast instead of stalling the pipeline
+LLM_TIMEOUT = 60  # seconds
+LLM_MAX_RETRIES = 2
+# Batch runs can afford to wait out rate limiting; the OpenAI client backs off exponentially with jitter
+LLM_BATCH_MAX_RETRIES = 5
+
+# Responses of deterministic (temperature 0) calls, keyed by LangChain on prompt + model settings
+LLM_RESPONSE_CACHE_SIZE = 256
+
+def _is_json_object(text):
+    try:
+        return isinstance(json.loads(text), dict)
+    except ValueError:
+        return False
+
+@lru_cache(maxsize=None)
+def get_llm_response_cache():
+    """
+    Get the process-wide in-memory cache for deterministic LLM responses.
+    Only completions that parse as a JSON object are stored, so a truncated or malformed
+    reply is asked for again next time instead of being served from memory.
+    """
+    from langchain_core.caches import InMemoryCache
+    
+    class JsonResponseCache(InMemoryCache):
+        def update(self, prompt, llm_string, return_val):
+            if all(_is_json_object(generation.text) for generation in return_val):
+                super().update(prompt, llm_string, return_val)
+        
+        async def aupdate(self, prompt, llm_string, return_val):
+            self.update(prompt, llm_string, return_val)
+    
+    return JsonResponseCache(maxsize=LLM_RESPONSE_CACHE_SIZE)
+
+# Shared LLM clients - built once per process so the HTTP connection pool is reused
+@lru_cache(maxsize=None)
+def get_chat_model(model, temperature=0, api_key=None, json_mode=False, max_retries=LLM_MAX_RETRIES, cache_responses=True):
+    """
+    Get a cached ChatOpenAI client for the given model settings.
+    Temperature 0 JSON clients (the parsers) answer repeated identical prompts from the response cache;
+    the creative generators keep fresh output on every call.
+    Callers that post-process free-form replies pass cache_responses=False.
+    Coroutines use get_async_chat_model instead.
+    """
+    return _build_chat_model(model, temperature, api_key, json_mode, max_retries, cache_responses)
+
+# Async clients, one set per event loop - see get_async_chat_model
+_loop_chat_models = weakref.WeakKeyDictionary()
+_loop_chat_models_lock = threading.Lock()
+
+def get_async_chat_model(model, temperature=0, api_key=None, json_mode=False, max_retries=LLM_MAX_RETRIES, cache_responses=True):
+    """
+    get_chat_model for coroutines: the client is shared within the running event loop only.
+    An async connection pool is bound to the loop it first ran on, so a client reused by a
+    later asyncio.run() fails with "Event loop is closed". Each loop gets its own HTTP pool,
+    dropped together with the loop.
+    """
+    from openai import DefaultAsyncHttpxClient
+    
+    loop = asyncio.get_running_loop()
+    key = (model, temperature, api_key, json_mode, max_retries, cache_responses)
+    with _loop_chat_models_lock:
+        clients = _loop_chat_models.setdefault(loop, {})
+        if key not in clients:
+            clients[key] = _build_chat_model(
+                *key, http_async_client=DefaultAsyncHttpxClient(timeout=LLM_TIMEOUT)
+            )
+        return clients[key]
+
+def _build_chat_model(model, temperature, api_key, json_mode, max_retries, cache_responses, http_async_client=None):
+    from langchain_openai import ChatOpenAI
+    
+    return ChatOpenAI(
+        openai_api_key=api_key or settings.OPENAI_API_KEY,
+        model=model,
+        temperature=temperature,
+        timeout=LLM_TIMEOUT,
+        max_retries=max_retries,
+        cache=get_llm_response_cache() if temperature == 0 and cache_responses else None,
+        model_kwargs={"response_format": {"type": "json_object"}} if json_mode else {},
+        http_async_client=http_async_client
+    )
+
+@lru_cache(maxsize=None)
+def get_embeddings_model(model="text-embedding-ada-002", api_key=None):
+    """Get a cached OpenAIEmbeddings client"""
+    from langchain_openai import OpenAIEmbeddings
+    
+    return OpenAIEmbeddings(
+        openai_api_key=api_key or settings.OPENAI_API_KEY,
+        model=model,
+        chunk_size=2048  # Max inputs per embeddings request, so a CV is one round trip
+    )
+
 # Additional utility functions for scraping configuration
+USER_AGENTS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/121.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:109.0) Gecko/20100101 Firefox/121.0"
+)
+
+# Everything except the User-Agent is static
+BASE_SCRAPING_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    "Accept-Encoding": "gzip, deflate, br",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+    "Sec-Fetch-Dest": "document",
+    "Sec-Fetch-Mode": "navigate",
+    "Sec-Fetch-Site": "none",
+    "Cache-Control": "max-age=0"
+    # Note: NO authentication cookies
+}
+
 def get_scraping_headers():
     """Generate clean headers without authentication"""
-    import random
-    
-    user_agents = [
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:109.0) Gecko/20100101 Firefox/121.0",
-        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10.15; rv:109.0) Gecko/20100101 Firefox/121.0"
-    ]
-    
-    return {
-        "User-Agent": random.choice(user_agents),
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-        "Accept-Language": "en-US,en;q=0.5",
-        "Accept-Encoding": "gzip, deflate, br",
-        "Connection": "keep-alive",
-        "Upgrade-Insecure-Requests": "1",
-        "Sec-Fetch-Dest": "document",
-        "Sec-Fetch-Mode": "navigate",
-        "Sec-Fetch-Site": "none",
-        "Cache-Control": "max-age=0"
-        # Note: NO authentication cookies
-    }
+    return {"User-Agent": random.choice(USER_AGENTS), **BASE_SCRAPING_HEADERS}
 
 def get_browser_args():
     """Get browser arguments for stealth scraping"""
@@ -101,6 +208,9 @@ SCRAPING_DELAY_MIN=2
 SCRAPING_DELAY_MAX=6
 MAX_RETRY_ATTEMPTS=3
 RETRY_DELAY=5
+LLM_MAX_CONCURRENCY=10
+JOB_PARSER_FAST_MODEL=gpt-4o-mini
+JOB_PARSER_STRONG_MODEL=gpt-4.1-mini
 
 # Advanced Options (optional)
 ENABLE_ALTERNATIVE_SOURCES=true
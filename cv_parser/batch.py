@@ -0,0 +1,90 @@
+import json
+import time
+from config import settings
+from cv_parser.cv_structurer import build_cv_messages
+
+# OpenAI Batch API - half the price of interactive calls, results within 24h.
+# Meant for offline runs over many CVs; the Streamlit app keeps using structure_cv.
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_DONE_STATUSES = ("completed", "failed", "expired", "cancelled")
+MESSAGE_ROLES = {"system": "system", "human": "user", "ai": "assistant"}
+
+def _get_client(api_key=None):
+    """Get an OpenAI client for the Files/Batches endpoints"""
+    from openai import OpenAI
+
+    return OpenAI(api_key=api_key or settings.OPENAI_API_KEY)
+
+def build_cv_batch_lines(cv_texts, model="gpt-4.1-mini"):
+    """
+    One JSONL request per CV, using the same prompt as structure_with_llm.
+    The custom_id carries the CV's index so results can be put back in order.
+    """
+    lines = []
+    for i, cv_text in enumerate(cv_texts):
+        messages = [
+            {"role": MESSAGE_ROLES[message.type], "content": message.content}
+            for message in build_cv_messages(cv_text)
+        ]
+        request = {
+            "custom_id": f"cv-{i}",
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": {
+                "model": model,
+                "temperature": 0,
+                "response_format": {"type": "json_object"},
+                "messages": messages
+            }
+        }
+        lines.append(json.dumps(request))
+    return "\n".join(lines)
+
+def submit_cv_batch(cv_texts, model="gpt-4.1-mini", api_key=None):
+    """
+    Upload the CVs as a batch job and return the batch id
+    """
+    client = _get_client(api_key)
+    batch_file = client.files.create(
+        file=("cv_batch.jsonl", build_cv_batch_lines(cv_texts, model).encode("utf-8")),
+        purpose="batch"
+    )
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window="24h"
+    )
+    return batch.id
+
+def poll_and_collect(batch_id, api_key=None, poll_interval=60):
+    """
+    Wait for a batch to finish and return the structured CVs in submission order.
+    Each entry is parsed like structure_with_llm's result ({"llm_raw": ...} / {"error": ...} on failure).
+    """
+    client = _get_client(api_key)
+    batch = client.batches.retrieve(batch_id)
+    while batch.status not in BATCH_DONE_STATUSES:
+        time.sleep(poll_interval)
+        batch = client.batches.retrieve(batch_id)
+
+    if not batch.output_file_id:
+        raise RuntimeError(f"Batch {batch_id} finished with status '{batch.status}' and no output")
+
+    results = {}
+    for line in client.files.content(batch.output_file_id).text.splitlines():
+        if not line.strip():
+            continue
+        item = json.loads(line)
+        index = int(item["custom_id"].split("-", 1)[1])
+        response = item.get("response") or {}
+        if item.get("error") or response.get("status_code") != 200:
+            results[index] = {"error": str(item.get("error") or response.get("body"))}
+            continue
+        text_response = response["body"]["choices"][0]["message"]["content"].strip()
+        try:
+            results[index] = json.loads(text_response)
+        except json.JSONDecodeError:
+            results[index] = {"llm_raw": text_response}
+
+    # Requests that failed validation only appear in the error file
+    return [results.get(i, {"error": "missing from batch output"}) for i in range(batch.request_counts.total)]
@@ -1,4 +1,4 @@
-from langchain_openai import OpenAIEmbeddings
+from config import get_embeddings_model
 
 def chunk_cv(cv_dict, chunk_size=500):
     """
@@ -7,28 +7,40 @@ def chunk_cv(cv_dict, chunk_size=500):
     chunks = []
     for section, content in cv_dict.items():
         text = content
-        # Split text into chunks
-        while len(text) > chunk_size:
-            split_idx = text[:chunk_size].rfind('\n')
+        header = f"{section.upper()}:\n"
+        # Walk an offset through the text instead of re-slicing the remainder each time
+        start = 0
+        while len(text) - start > chunk_size:
+            # Split at the last newline in the window (never at the window's first char, which
+            # is the newline the previous chunk ended on)
+            split_idx = text.rfind('\n', start + 1, start + chunk_size)
             if split_idx == -1:
-                split_idx = chunk_size
-            chunks.append(f"{section.upper()}:\n{text[:split_idx]}")
-            text = text[split_idx:]
-        if text.strip():
-            chunks.append(f"{section.upper()}:\n{text.strip()}")
+                split_idx = start + chunk_size
+            chunks.append(header + text[start:split_idx])
+            start = split_idx
+        rest = text[start:].strip()
+        if rest:
+            chunks.append(header + rest)
     return chunks
 
 def embed_cv(chunks, api_key):
     """
     Given a list of text chunks, returns their OpenAI embeddings.
+    All chunks are sent in batched requests rather than one request per chunk.
     """
-    embeddings_model = OpenAIEmbeddings(
-        openai_api_key=api_key,
-        model="text-embedding-ada-002"
-    )
+    embeddings_model = get_embeddings_model("text-embedding-ada-002", api_key)
     
-    embeddings = []
-    for chunk in chunks:
-        vector = embeddings_model.embed_query(chunk)
-        embeddings.append({"text": chunk, "embedding": vector})
-    return embeddings
\ No newline at end of file
+    # Repeated chunks (e.g. identical skill bullets) are embedded once
+    unique_chunks = list(dict.fromkeys(chunks))
+    vectors = dict(zip(unique_chunks, embeddings_model.embed_documents(unique_chunks)))
+    return [{"text": chunk, "embedding": vectors[chunk]} for chunk in chunks]
+
+async def embed_cv_async(chunks, api_key):
+    """
+    Async variant of embed_cv for callers already running an event loop.
+    """
+    embeddings_model = get_embeddings_model("text-embedding-ada-002", api_key)
+    
+    unique_chunks = list(dict.fromkeys(chunks))
+    vectors = dict(zip(unique_chunks, await embeddings_model.aembed_documents(unique_chunks)))
+    return [{"text": chunk, "embedding": vectors[chunk]} for chunk in chunks]
@@ -1,21 +1,47 @@
-
+import io
 import os
+import re
+import zipfile
+from xml.etree import ElementTree
 
-def read_pdf(file_path):
+# Try to import PyMuPDF for PDF CVs - LaTeX and .docx CVs work without it
+try:
     import fitz  # PyMuPDF, install with: pip install pymupdf
-    doc = fitz.open(file_path)
-    text = ""
-    for page in doc:
-        text += page.get_text()
-    return text
+    PYMUPDF_AVAILABLE = True
+except ImportError:
+    PYMUPDF_AVAILABLE = False
+
+# Simple LaTeX commands, compiled once: \cmd{arg} keeps arg, a bare \cmd is dropped
+LATEX_CMD_WITH_ARG = re.compile(r'\\[a-zA-Z]+\{([^}]*)\}')
+LATEX_CMD = re.compile(r'\\[a-zA-Z]+')
+
+WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+# Drawings (text boxes) come as mc:AlternateContent - a Choice plus a legacy Fallback copy of the same text
+MC_NS = "{http://schemas.openxmlformats.org/markup-compatibility/2006}"
+# Run-level elements that stand for characters, as python-docx's paragraph.text renders them
+WORD_RUN_CHARS = {f"{WORD_NS}tab": "\t", f"{WORD_NS}br": "\n", f"{WORD_NS}cr": "\n"}
+
+def read_pdf(file_path):
+    if not PYMUPDF_AVAILABLE:
+        raise ImportError("Reading PDF CVs requires PyMuPDF: pip install pymupdf")
+    if isinstance(file_path, bytes):
+        doc = fitz.open(stream=file_path, filetype="pdf")
+    else:
+        doc = fitz.open(file_path)
+    # Join once instead of growing a string per page; closing frees the document's native memory
+    with doc:
+        return "".join(page.get_text() for page in doc)
 
 def read_latex(file_path):
     """
     Very simple: Strips LaTeX commands and extracts main text.
     This can be enhanced using textract or custom logic.
     """
-    with open(file_path, 'r', encoding='utf-8') as f:
-        lines = f.readlines()
+    if isinstance(file_path, bytes):
+        lines = file_path.decode('utf-8').splitlines()
+    else:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
     # Remove lines starting with % (comments) and LaTeX commands
     content = []
     for line in lines:
@@ -29,34 +55,61 @@ def read_latex(file_path):
     return "\n".join(content)
 
 def remove_latex_commands(line):
-    import re
     # Remove simple LaTeX commands (not bulletproof, but works for most resumes)
-    line = re.sub(r'\\[a-zA-Z]+\{([^}]*)\}', r'\1', line)
-    line = re.sub(r'\\[a-zA-Z]+', '', line)
+    line = LATEX_CMD_WITH_ARG.sub(r'\1', line)
+    line = LATEX_CMD.sub('', line)
     return line
 
-def read_cv(file_path):
-    ext = os.path.splitext(file_path)[-1].lower()
-    if ext == ".pdf":
-        return read_pdf(file_path)
-    elif ext in [".tex", ".latex"]:
-        return read_latex(file_path)
-    else:
-        raise ValueError(f"Unsupported file type: {ext}")
-    
 def read_docx(file_path):
-    from docx import Document  # pip install python-docx
-    doc = Document(file_path)
-    text = "\n".join([para.text for para in doc.paragraphs])
-    return text
+    """
+    Read paragraph text straight from word/document.xml - no python-docx object model,
+    and paragraphs inside tables are included.
+    """
+    if isinstance(file_path, bytes):
+        file_path = io.BytesIO(file_path)
+    with zipfile.ZipFile(file_path) as docx:
+        root = ElementTree.fromstring(docx.read("word/document.xml"))
+    return "\n".join(_docx_paragraph_text(p) for p in _docx_paragraphs(root))
+
+def _docx_paragraph_text(paragraph):
+    """Text of one w:p, keeping tabs and line breaks - nested text-box paragraphs are read on their own"""
+    parts = []
+    for element in _docx_own_elements(paragraph):
+        if element.tag == f"{WORD_NS}t":
+            parts.append(element.text or "")
+        elif element.tag in WORD_RUN_CHARS:
+            parts.append(WORD_RUN_CHARS[element.tag])
+    return "".join(parts)
+
+def _docx_own_elements(element):
+    """Descendants of element, skipping nested w:p and the mc:Fallback copies of mc:AlternateContent"""
+    for child in element:
+        if child.tag in (f"{WORD_NS}p", f"{MC_NS}Fallback"):
+            continue
+        yield child
+        yield from _docx_own_elements(child)
+
+def _docx_paragraphs(element):
+    """Every w:p in document order, outside mc:Fallback copies"""
+    for child in element:
+        if child.tag == f"{MC_NS}Fallback":
+            continue
+        if child.tag == f"{WORD_NS}p":
+            yield child
+        yield from _docx_paragraphs(child)
 
-def read_cv(file_path):
+def read_cv(file_path, data=None):
+    """
+    Read a CV from disk, or from `data` bytes already in memory.
+    When `data` is given, `file_path` is only used for its extension.
+    """
     ext = os.path.splitext(file_path)[-1].lower()
+    source = file_path if data is None else data
     if ext == ".pdf":
-        return read_pdf(file_path)
+        return read_pdf(source)
     elif ext in [".tex", ".latex"]:
-        return read_latex(file_path)
+        return read_latex(source)
     elif ext == ".docx":
-        return read_docx(file_path)
+        return read_docx(source)
     else:
         raise ValueError(f"Unsupported file type: {ext}")
\ No newline at end of file
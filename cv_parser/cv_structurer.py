@@ -1,55 +1,161 @@
-from langchain_openai import ChatOpenAI
 from langchain.schema import SystemMessage, HumanMessage
+import asyncio
 import json
-from config import settings
+import re
+from concurrent.futures import ThreadPoolExecutor
+from config import settings, get_chat_model, get_async_chat_model, LLM_BATCH_MAX_RETRIES
+
+# Whitespace-only differences (re-uploads, copy/paste) should still hit the LLM response cache
+_INLINE_SPACE_RE = re.compile(r'[ \t\r\f\v]+')
+_LINE_EDGE_RE = re.compile(r' ?\n ?')
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
+def normalize_whitespace(text: str) -> str:
+    """Collapse runs of spaces and blank lines, keeping the line structure the LLM relies on"""
+    text = _LINE_EDGE_RE.sub('\n', _INLINE_SPACE_RE.sub(' ', text))
+    return _BLANK_LINES_RE.sub('\n\n', text).strip()
+
+# Standardized sections, and the headings the regex fallback recognises for each
+CV_SECTION_KEYS = ("professional_summary", "education", "experience", "technical_skills", "projects", "certifications")
+SECTION_HEADING_KEYS = {
+    "summary": "professional_summary",
+    "profile": "professional_summary",
+    "professional summary": "professional_summary",
+    "about me": "professional_summary",
+    "education": "education",
+    "experience": "experience",
+    "work experience": "experience",
+    "professional experience": "experience",
+    "employment": "experience",
+    "skills": "technical_skills",
+    "technical skills": "technical_skills",
+    "projects": "projects",
+    "certifications": "certifications",
+    "certificates": "certifications",
+}
+_SECTION_HEADING_RE = re.compile(
+    r'^[ \t#*]*(' + '|'.join(sorted(SECTION_HEADING_KEYS, key=len, reverse=True)) + r')[ \t*]*:?[ \t]*$',
+    re.IGNORECASE | re.MULTILINE
+)
+
+# Longer CVs are split before prompting so one request stays well inside the context window
+# and its latency stays bounded (~4 characters per token, so roughly 8k tokens per part)
+MAX_CV_CHARS = 32000
+_SECTION_BREAK_RE = re.compile(r'\n\s*\n')
+
+# Static instructions, identical on every call so the provider can reuse the cached prompt prefix
+CV_SYSTEM_PROMPT = """You extract structured information from CVs in any format, order or section headings.
+Return a JSON object with these keys: professional_summary, education, experience, technical_skills, projects, certifications.
+Map differently named sections (e.g. 'Background', 'Career History', 'Skills & Tools', 'Employment') and content mixed into bullets, paragraphs or tables to these keys.
+Use an empty string for any section the CV does not cover."""
 
 def structure_cv(cv_text, api_key=None, model="gpt-4.1-mini"):
     """
     Parse the CV into sections using either OpenAI LLM (if api_key) or fallback regex method.
     Returns a dict: {section: content}
     """
-    if api_key or settings.OPENAI_API_KEY:
-        structured = structure_with_llm(cv_text, api_key or settings.OPENAI_API_KEY, model)
-    return structured
+    api_key = api_key or settings.OPENAI_API_KEY
+    return structure_with_llm(cv_text, api_key, model) if api_key else _structure_with_regex(cv_text)
 
-def structure_with_llm(cv_text, api_key, model):
+def _structure_with_regex(cv_text):
     """
-    Structure CV using LangChain ChatOpenAI
+    Offline fallback: slice the CV at lines that look like common section headings.
+    Text before the first heading counts as the summary.
     """
-    llm = ChatOpenAI(
-        openai_api_key=api_key,
-        model=model,
-        temperature=0
-    )
-
-    system_prompt = "You are a helpful assistant that extracts structured information from CVs in any format."
-    
-    user_prompt = f"""
-You are an expert CV information extractor. Given ANY CV text—regardless of format, order, or section headings—extract and return a JSON object with these standardized keys:
+    structured = dict.fromkeys(CV_SECTION_KEYS, "")
+    headings = list(_SECTION_HEADING_RE.finditer(cv_text))
+    structured["professional_summary"] = cv_text[:headings[0].start() if headings else len(cv_text)].strip()
+    for heading, next_heading in zip(headings, headings[1:] + [None]):
+        key = SECTION_HEADING_KEYS[heading.group(1).lower()]
+        content = cv_text[heading.end():next_heading.start() if next_heading else len(cv_text)].strip()
+        structured[key] = f"{structured[key]}\n\n{content}".strip()
+    return structured
 
-- professional_summary
-- education
-- experience
-- technical_skills
-- projects
-- certifications
+def build_cv_messages(cv_text):
+    """
+    Build the chat messages that ask the LLM to structure a CV.
+    All instructions live in the shared system prompt; the user message is just the CV.
+    """
+    return [
+        SystemMessage(content=CV_SYSTEM_PROMPT),
+        HumanMessage(content=f"CV TEXT:\n{normalize_whitespace(cv_text)}")
+    ]
 
-For each, extract the content even if the CV uses different headings (e.g. 'Summary', 'Background', 'Career History', 'Skills & Tools', 'Employment', 'Learning', etc.) or has the content mixed in bullet points, paragraphs, or tables.
+def split_cv_text(cv_text, max_chars=MAX_CV_CHARS):
+    """
+    Split an oversized CV on blank-line (section) boundaries into parts of at most max_chars.
+    A normal CV comes back as a single part.
+    """
+    if len(cv_text) <= max_chars:
+        return [cv_text]
+    parts = []
+    current = ""
+    for block in _SECTION_BREAK_RE.split(cv_text):
+        # A single block longer than the limit is cut hard - it still has to fit the context.
+        # Flush what came before it first so the parts stay in document order
+        if len(block) > max_chars and current:
+            parts.append(current)
+            current = ""
+        while len(block) > max_chars:
+            parts.append(block[:max_chars])
+            block = block[max_chars:]
+        if current and len(current) + len(block) + 2 > max_chars:
+            parts.append(current)
+            current = ""
+        current = f"{current}\n\n{block}" if current else block
+    if current:
+        parts.append(current)
+    return parts
 
-If information is missing for a section, return an empty string for that section.
+def merge_structured_cvs(results):
+    """
+    Merge the structured parts of a split CV by key: strings are joined, lists are concatenated.
+    A failed part (error / unparsable output) is returned as the overall result.
+    """
+    if len(results) == 1:
+        return results[0]
+    merged = {}
+    for result in results:
+        if "error" in result or "llm_raw" in result:
+            return result
+        for key, value in result.items():
+            if not value:
+                merged.setdefault(key, value)
+            elif not merged.get(key):
+                merged[key] = value
+            elif isinstance(merged[key], list) and isinstance(value, list):
+                merged[key] = merged[key] + value
+            else:
+                merged[key] = f"{merged[key]}\n\n{value}"
+    return merged
 
-Return only a clean JSON object as your response. Do NOT include any explanation or commentary.
+def structure_with_llm(cv_text, api_key, model):
+    """
+    Structure CV using LangChain ChatOpenAI.
+    Oversized CVs are split and their parts structured concurrently, then merged.
+    """
+    parts = split_cv_text(cv_text)
+    if len(parts) == 1:
+        return _structure_part(cv_text, api_key, model)
+    with ThreadPoolExecutor(max_workers=min(len(parts), settings.LLM_MAX_CONCURRENCY)) as executor:
+        return merge_structured_cvs(list(executor.map(lambda part: _structure_part(part, api_key, model), parts)))
 
-CV TEXT:
------
-{cv_text}
------
-"""
+async def astructure_with_llm(cv_text, api_key, model, semaphore=None):
+    """
+    Async version of structure_with_llm - awaits the LLM call instead of blocking the event loop.
+    Unlike the sync version, API errors are raised rather than returned as {"error": ...}.
+    `semaphore` caps in-flight part requests (shared across CVs by astructure_cvs); by default
+    at most settings.LLM_MAX_CONCURRENCY parts of this CV are sent at once.
+    """
+    semaphore = semaphore or asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+    parts = split_cv_text(cv_text)
+    results = await asyncio.gather(*(_astructure_part(part, api_key, model, semaphore) for part in parts))
+    return merge_structured_cvs(results)
 
-    messages = [
-        SystemMessage(content=system_prompt),
-        HumanMessage(content=user_prompt)
-    ]
+def _structure_part(cv_text, api_key, model):
+    """Structure one CV (or one part of a split CV) with a single LLM call"""
+    llm = get_chat_model(model, api_key=api_key, json_mode=True)
+    messages = build_cv_messages(cv_text)
     
     try:
         # Use invoke instead of __call__ to fix deprecation warning
@@ -59,4 +165,44 @@ CV TEXT:
     except json.JSONDecodeError:
         return {"llm_raw": text_response}
     except Exception as e:
-        return {"error": str(e)}
\ No newline at end of file
+        return {"error": str(e)}
+
+async def _astructure_part(cv_text, api_key, model, semaphore):
+    """
+    Async version of _structure_part; the request is sent while holding a semaphore slot.
+    Transient API errors are retried by the client; anything still failing propagates to the caller.
+    """
+    llm = get_async_chat_model(model, api_key=api_key, json_mode=True, max_retries=LLM_BATCH_MAX_RETRIES)
+    messages = build_cv_messages(cv_text)
+    
+    async with semaphore:
+        response = await llm.ainvoke(messages)
+    text_response = response.content.strip()
+    try:
+        return json.loads(text_response)
+    except json.JSONDecodeError:
+        return {"llm_raw": text_response}
+
+async def astream_structure_cv(cv_text, api_key=None, model="gpt-4.1-mini"):
+    """
+    Stream the structured-CV JSON as the LLM produces it, yielding text chunks.
+    Lets a caller show progress before the full JSON is ready; json.loads the joined chunks at the end.
+    """
+    llm = get_async_chat_model(model, api_key=api_key or settings.OPENAI_API_KEY, json_mode=True)
+    async for chunk in llm.astream(build_cv_messages(cv_text)):
+        if chunk.content:
+            yield chunk.content
+
+async def astructure_cvs(cv_texts, api_key=None, model="gpt-4.1-mini"):
+    """
+    Structure several CVs concurrently, so N CVs take about one LLM round trip instead of N.
+    At most settings.LLM_MAX_CONCURRENCY requests are in flight at once, counting every part of a split CV.
+    Returns the structured dicts in the same order as cv_texts; a CV whose request failed gets {"error": ...}.
+    """
+    api_key = api_key or settings.OPENAI_API_KEY
+    semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+    results = await asyncio.gather(
+        *(astructure_with_llm(cv_text, api_key, model, semaphore) for cv_text in cv_texts),
+        return_exceptions=True
+    )
+    return [{"error": str(result)} if isinstance(result, Exception) else result for result in results]
\ No newline at end of file
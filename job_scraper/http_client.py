@@ -0,0 +1,99 @@
+import asyncio
+import atexit
+import random
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+import requests
+from requests.adapters import HTTPAdapter
+
+# LinkedIn answers bursts with HTTP 999/429, so every LinkedIn call - plain HTTP and browser
+# navigations alike - shares one pacing limit.
+# Scrapes run on separate threads (each with its own event loop), hence threading primitives.
+LINKEDIN_MAX_CONCURRENT = 2
+LINKEDIN_MIN_INTERVAL = 1.5  # seconds between request starts
+RETRY_STATUSES = (429, 500, 502, 503, 504, 999)
+
+_session = None
+_linkedin_slots = threading.BoundedSemaphore(LINKEDIN_MAX_CONCURRENT)
+_pace_lock = threading.Lock()
+_next_request_at = 0.0
+
+def get_session() -> requests.Session:
+    """
+    Shared HTTP session for all plain-HTTP LinkedIn calls.
+    Keep-alive connections are pooled so repeated calls skip the TCP+TLS handshake.
+    """
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=20)
+        _session.mount("https://", adapter)
+        _session.mount("http://", adapter)
+        atexit.register(close_session)
+    return _session
+
+def close_session():
+    """Close the shared session and its pooled connections"""
+    global _session
+    if _session is not None:
+        _session.close()
+        _session = None
+
+def _reserve_turn() -> float:
+    """Claim the next LinkedIn request start; returns how many seconds to wait for it"""
+    global _next_request_at
+    with _pace_lock:
+        now = time.monotonic()
+        wait = _next_request_at - now
+        _next_request_at = max(now, _next_request_at) + LINKEDIN_MIN_INTERVAL
+    return max(0.0, wait)
+
+@contextmanager
+def linkedin_slot():
+    """
+    Hold one of the shared LinkedIn slots, starting no sooner than the pacing allows.
+    Blocks the calling thread - use async_linkedin_slot() inside coroutines.
+    """
+    with _linkedin_slots:
+        time.sleep(_reserve_turn())
+        yield
+
+@asynccontextmanager
+async def async_linkedin_slot():
+    """
+    linkedin_slot() for coroutines (crawl4ai/Playwright navigations): the slot is acquired
+    on a worker thread and the pacing wait is an asyncio.sleep, so the event loop keeps running.
+    """
+    acquire = asyncio.ensure_future(asyncio.to_thread(_linkedin_slots.acquire))
+    try:
+        await asyncio.shield(acquire)
+    except asyncio.CancelledError:
+        # The worker thread still takes the slot - hand it straight back
+        acquire.add_done_callback(lambda _: _linkedin_slots.release())
+        raise
+    try:
+        await asyncio.sleep(_reserve_turn())
+        yield
+    finally:
+        _linkedin_slots.release()
+
+def linkedin_get(url: str, session: requests.Session = None, max_attempts: int = 3, **kwargs) -> requests.Response:
+    """
+    GET a LinkedIn URL under the shared rate limit.
+    Throttling (429/999), 5xx responses and connection errors/timeouts are retried with
+    exponential backoff and jitter; the last response (or error) is returned (or raised).
+    """
+    session = session or get_session()
+    for attempt in range(max_attempts):
+        last_attempt = attempt == max_attempts - 1
+        try:
+            with linkedin_slot():
+                response = session.get(url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if last_attempt:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUSES or last_attempt:
+                return response
+        time.sleep(min(30, 2 ** attempt + random.uniform(0, 1)))
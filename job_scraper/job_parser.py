@@ -1,73 +1,100 @@
-from langchain_openai import ChatOpenAI
 from langchain.schema import SystemMessage, HumanMessage
+import asyncio
 import json
-import re
-from config import settings
+from config import settings, get_chat_model, get_async_chat_model, LLM_BATCH_MAX_RETRIES
 
-def parse_job_description(job_markdown: str, model: str = "gpt-4.1-mini") -> dict:
+# Job ads are short; anything past this is page boilerplate, cut so one request stays bounded (~4k tokens)
+MAX_JOB_CHARS = 16000
+
+# A parse missing any of these is escalated to the strong model
+ESSENTIAL_JOB_FIELDS = ("title", "requirements", "key_skills")
+
+# Static instructions, identical on every call so the provider can reuse the cached prompt prefix
+JOB_SYSTEM_PROMPT = """You parse job descriptions written in markdown into structured data.
+Return a JSON object with these keys: title, company, location, seniority_level, responsibilities (list), requirements (list), key_skills (list)."""
+
+def build_job_messages(job_markdown: str) -> list:
+    """
+    Build the chat messages that ask the LLM to parse a job description.
+    All instructions live in the shared system prompt; the user message is just the posting.
+    """
+    return [
+        SystemMessage(content=JOB_SYSTEM_PROMPT),
+        HumanMessage(content=f"Job description:\n{job_markdown[:MAX_JOB_CHARS]}")
+    ]
+
+def parse_job_description(job_markdown: str, model: str = None) -> dict:
     """
     Convert a job description into a structured JSON:
     -> title, responsibilities, requirements, location, seniority, skills.
     Uses OpenAI API key from config.py
+    Without an explicit model, the fast model is tried first and the strong model only handles
+    postings it could not parse.
     """
-    llm = ChatOpenAI(
-        openai_api_key=settings.OPENAI_API_KEY,
-        model=model,
-        temperature=0
-    )
-    
-    system_prompt = "You are a parser extracting structured data from job postings. Always return valid JSON without markdown formatting."
-    
-    user_prompt = f"""
-You are a skilled job-ad parser. Given the following job description in markdown format, extract the following fields in JSON:
-- title
-- company
-- location
-- seniority_level
-- responsibilities (list)
-- requirements (list)
-- key_skills (list)
+    if model:
+        return _parse_with_model(job_markdown, model)
+    parsed = _parse_with_model(job_markdown, settings.JOB_PARSER_FAST_MODEL)
+    if needs_stronger_model(parsed):
+        parsed = _parse_with_model(job_markdown, settings.JOB_PARSER_STRONG_MODEL)
+    return parsed
 
-IMPORTANT: Return ONLY the JSON object, no markdown formatting, no code blocks, no extra text.
+def needs_stronger_model(parsed: dict) -> bool:
+    """True when a parse failed or left one of the fields matching depends on empty"""
+    return "error" in parsed or not all(parsed.get(field) for field in ESSENTIAL_JOB_FIELDS)
 
-Job description:
-----
-{job_markdown}
-----
-"""
-
-    messages = [
-        SystemMessage(content=system_prompt),
-        HumanMessage(content=user_prompt)
-    ]
+def _parse_with_model(job_markdown: str, model: str) -> dict:
+    """Parse a job description with a single call to the given model"""
+    llm = get_chat_model(model, json_mode=True)
+    messages = build_job_messages(job_markdown)
     
     try:
-        response = llm(messages)
+        response = llm.invoke(messages)
+        # JSON mode - the reply is the bare object, no code fences to strip
         content = response.content.strip()
-        
-        # Remove markdown code blocks if present
-        content = clean_json_response(content)
-        
         return json.loads(content)
     except json.JSONDecodeError:
         return {"error": "failed to parse JSON", "raw": content}
     except Exception as e:
         return {"error": "API call failed", "details": str(e)}
 
-def clean_json_response(content: str) -> str:
+async def aparse_job_description(job_markdown: str, model: str = None) -> dict:
     """
-    Clean JSON response by removing markdown code blocks and extra formatting
+    Async version of parse_job_description - awaits the LLM call instead of blocking the event loop.
+    Transient API errors are retried by the client; anything still failing is raised, not returned.
     """
-    # Remove markdown code blocks
-    content = re.sub(r'```json\s*', '', content)
-    content = re.sub(r'```\s*', '', content)
-    
-    # Remove any leading/trailing whitespace
-    content = content.strip()
-    
-    # If content starts with text before JSON, try to extract JSON
-    json_match = re.search(r'\{.*\}', content, re.DOTALL)
-    if json_match:
-        content = json_match.group(0)
+    if model:
+        return await _aparse_with_model(job_markdown, model)
+    parsed = await _aparse_with_model(job_markdown, settings.JOB_PARSER_FAST_MODEL)
+    if needs_stronger_model(parsed):
+        parsed = await _aparse_with_model(job_markdown, settings.JOB_PARSER_STRONG_MODEL)
+    return parsed
+
+async def _aparse_with_model(job_markdown: str, model: str) -> dict:
+    """Async version of _parse_with_model"""
+    llm = get_async_chat_model(model, json_mode=True, max_retries=LLM_BATCH_MAX_RETRIES)
+    messages = build_job_messages(job_markdown)
     
-    return content
\ No newline at end of file
+    response = await llm.ainvoke(messages)
+    content = response.content.strip()
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        return {"error": "failed to parse JSON", "raw": content}
+
+async def aparse_jobs(job_markdowns: list, model: str = None) -> list:
+    """
+    Parse several job descriptions concurrently, in the same order as job_markdowns.
+    At most settings.LLM_MAX_CONCURRENCY requests are in flight at once.
+    A job whose request failed gets {"error": "API call failed", ...} and the rest still complete.
+    """
+    semaphore = asyncio.Semaphore(settings.LLM_MAX_CONCURRENCY)
+
+    async def bounded(job_markdown):
+        async with semaphore:
+            return await aparse_job_description(job_markdown, model)
+
+    results = await asyncio.gather(*(bounded(job_markdown) for job_markdown in job_markdowns), return_exceptions=True)
+    return [
+        {"error": "API call failed", "details": str(result)} if isinstance(result, Exception) else result
+        for result in results
+    ]
\ No newline at end of file
@@ -4,17 +4,18 @@ LinkedIn Profile Scraper - Enhanced version for job_scraper module
 
 Robust LinkedIn profile scraper with multiple fallback methods:
 - Basic CSS extraction with crawl4ai
-- Manual extraction with BeautifulSoup  
+- Manual extraction with selectolax (or BeautifulSoup)
 - Stealth mode with Playwright
 - Manual input as final fallback
 
 Dependencies:
-pip install crawl4ai playwright beautifulsoup4
+pip install crawl4ai playwright selectolax  (or beautifulsoup4)
 """
 import os, json, asyncio, sys, time, re
 from pathlib import Path
 from datetime import datetime
 from playwright.async_api import async_playwright, TimeoutError as PWTimeout
+from job_scraper.http_client import async_linkedin_slot
 
 # Try to import crawl4ai, fallback to manual extraction if not available
 try:
@@ -26,7 +27,13 @@ except ImportError:
     print("⚠️  crawl4ai not installed, will use manual extraction")
     CRAWL4AI_AVAILABLE = False
 
-# Try to import BeautifulSoup for fallback
+# Try to import selectolax (C-backed lexbor parser) for fallback, then BeautifulSoup
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
 try:
     from bs4 import BeautifulSoup
     BS4_AVAILABLE = True
@@ -40,14 +47,19 @@ def get_linkedin_credentials():
     return email, password
 
 # ───────────────────────── Enhanced helpers ─────────────────────────
+async def goto_linkedin(page, url, timeout=30000):
+    """Navigate under the shared LinkedIn rate limit (same slots as the job and company fetches)"""
+    async with async_linkedin_slot():
+        return await page.goto(url, timeout=timeout)
+
 async def wait_and_click(page, selector, timeout=10000, description="element"):
     """Enhanced click with better waiting and error handling"""
     try:
         element = page.locator(selector).first
         await element.wait_for(state="visible", timeout=timeout)
-        await asyncio.sleep(0.5)
+        # No fixed pauses - click() itself waits until the element is stable and enabled
+        await element.scroll_into_view_if_needed()
         await element.click(timeout=5000)
-        await asyncio.sleep(1)
         return True
     except PWTimeout:
         return False
@@ -57,39 +69,37 @@ async def wait_and_click(page, selector, timeout=10000, description="element"):
 async def safe_fill(page, selector, value, description="field"):
     """Safe form filling with error handling"""
     try:
-        await page.wait_for_selector(selector, timeout=10000)
-        await asyncio.sleep(0.5)
-        await page.fill(selector, "")
-        await asyncio.sleep(0.3)
-        await page.fill(selector, value)
-        await asyncio.sleep(0.5)
+        await page.wait_for_selector(selector, state="visible", timeout=10000)
+        # fill() waits for the field to be editable and replaces any existing value
+        await page.fill(selector, value, timeout=10000)
         return True
     except Exception:
         return False
 
+# Cookie banners, toasts and overlays - probed as one selector list so a sweep is a single round trip
+BANNER_SELECTORS = (
+    "button:has-text('Accept cookies')",
+    "button:has-text('Accept')",
+    "button[aria-label='Dismiss']",
+    "button[aria-label='Close']",
+    "button.artdeco-modal__dismiss",
+    "button[data-tracking-control-name*='dismiss']",
+    ".msg-overlay-bubble-header__dismiss",
+    ".artdeco-toast-item__dismiss"
+)
+BANNER_SELECTOR = ", ".join(BANNER_SELECTORS)
+
 async def close_banners_enhanced(page):
-    """Enhanced banner closing with more selectors"""
-    banner_selectors = [
-        "button:has-text('Accept cookies')",
-        "button:has-text('Accept')",
-        "button[aria-label='Dismiss']",
-        "button[aria-label='Close']",
-        "button.artdeco-modal__dismiss",
-        "button[data-tracking-control-name*='dismiss']",
-        ".msg-overlay-bubble-header__dismiss",
-        ".artdeco-toast-item__dismiss"
-    ]
-    
-    for selector in banner_selectors:
-        try:
-            if await page.locator(selector).first.is_visible():
-                await page.locator(selector).first.click(timeout=2000)
-                await asyncio.sleep(0.5)
-        except:
-            continue
+    """Enhanced banner closing - all visible banners are found in one query and clicked concurrently"""
+    try:
+        banners = await page.locator(f"{BANNER_SELECTOR} >> visible=true").all()
+    except Exception:
+        return
+    results = await asyncio.gather(*(banner.click(timeout=500) for banner in banners), return_exceptions=True)
     
-    await page.keyboard.press("Escape")
-    await asyncio.sleep(1)
+    # Escape only when something was actually dismissed (closes the modal it may have left behind)
+    if any(not isinstance(result, Exception) for result in results):
+        await page.keyboard.press("Escape")
 
 async def check_auth_status(page):
     """Check if we're properly authenticated"""
@@ -123,7 +133,7 @@ async def enhanced_tab_login(ctx, email, password, max_retries=3):
         tab = None
         try:
             tab = await ctx.new_page()
-            await tab.goto("https://www.linkedin.com/login", timeout=30000)
+            await goto_linkedin(tab, "https://www.linkedin.com/login")
             await asyncio.sleep(2)
             
             if not await safe_fill(tab, "#username", email, "email"):
@@ -191,14 +201,27 @@ async def enhanced_modal_login(page, email, password, max_retries=2):
     
     return False
 
+# Scrolls in-page until the bottom is reached and the document has stopped growing, so
+# lazy-loaded sections render without a Python round trip (and fixed sleep) per step
+SCROLL_TO_END_JS = """
+async () => {
+    let lastHeight = 0;
+    for (let i = 0; i < 20; i++) {
+        window.scrollBy(0, 1200);
+        await new Promise(resolve => setTimeout(resolve, 400));
+        const height = document.body.scrollHeight;
+        const atBottom = window.innerHeight + window.scrollY >= height;
+        if (atBottom && height === lastHeight) break;
+        lastHeight = height;
+    }
+}
+"""
+
 async def scroll_page_slowly(page):
     """Scroll through the page to load all content"""
-    scroll_distances = [400, 800, 1200, 1600, 2000, 2400, 2800]
-    
-    for i, distance in enumerate(scroll_distances):
-        await page.mouse.wheel(0, distance - (scroll_distances[i-1] if i > 0 else 0))
-        await asyncio.sleep(1.5)
-        await close_banners_enhanced(page)
+    await close_banners_enhanced(page)
+    await page.evaluate(SCROLL_TO_END_JS)
+    await close_banners_enhanced(page)
 
 # ───────────────────────── Content extraction functions ─────────────────────────
 LINKEDIN_EXTRACTION_SCHEMA = {
@@ -252,29 +275,37 @@ LINKEDIN_EXTRACTION_SCHEMA = {
     ]
 }
 
+# Compiled once at import - clean_text and parse_experience_item run on every extracted fragment
+_WS_RE = re.compile(r'\s+')
+# UI noise, fused into one alternation so each fragment is scanned once
+_UI_PATTERNS = (
+    r'Show more.*?Show less',
+    r'See more.*?See less',
+    r'…see more',
+    r'Show all \d+ experiences?',
+    r'Show all \d+ educations?',
+    r'\d+ mutual connections?',
+    r'Connect\s*Message\s*More',
+    r'Follow\s*Message\s*More',
+    r'View profile.*?View profile',
+    r'Send message.*?Send message'
+)
+_UI_NOISE_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in _UI_PATTERNS), re.IGNORECASE)
+_DATE_RE = re.compile(
+    r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4}'
+    r'|\d{4}\s*[-–—]\s*\d{4}'
+    r'|\d{4}\s*[-–—]\s*Present'
+    r'|\d{1,2}/\d{4}',
+    re.IGNORECASE
+)
+
 def clean_text(text):
     """Clean extracted text content"""
     if not text:
         return ""
     
-    text = re.sub(r'\s+', ' ', text.strip())
-    
-    ui_patterns = [
-        r'Show more.*?Show less',
-        r'See more.*?See less', 
-        r'…see more',
-        r'Show all \d+ experiences?',
-        r'Show all \d+ educations?',
-        r'\d+ mutual connections?',
-        r'Connect\s*Message\s*More',
-        r'Follow\s*Message\s*More',
-        r'View profile.*?View profile',
-        r'Send message.*?Send message'
-    ]
-    
-    for pattern in ui_patterns:
-        text = re.sub(pattern, '', text, flags=re.IGNORECASE)
-    
+    text = _WS_RE.sub(' ', text.strip())
+    text = _UI_NOISE_RE.sub('', text)
     return text.strip()
 
 def parse_experience_item(text):
@@ -291,24 +322,13 @@ def parse_experience_item(text):
     if len(lines) > 1:
         result['organization'] = lines[1]
     
-    date_patterns = [
-        r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+\d{4}',
-        r'\d{4}\s*[-–—]\s*\d{4}',
-        r'\d{4}\s*[-–—]\s*Present',
-        r'\d{1,2}/\d{4}'
-    ]
-    
-    for line in lines:
-        for pattern in date_patterns:
-            if re.search(pattern, line, re.IGNORECASE):
-                result['duration'] = line
-                break
+    # Each line is checked for a date once; the last dated line is the duration
+    is_duration = [bool(_DATE_RE.search(line)) for line in lines]
+    for line, dated in zip(lines, is_duration):
+        if dated:
+            result['duration'] = line
     
-    desc_lines = []
-    for line in lines[2:]:
-        is_duration = any(re.search(pattern, line, re.IGNORECASE) for pattern in date_patterns)
-        if not is_duration:
-            desc_lines.append(line)
+    desc_lines = [line for line, dated in zip(lines[2:], is_duration[2:]) if not dated]
     
     if desc_lines:
         result['description'] = ' '.join(desc_lines)
@@ -433,22 +453,44 @@ def process_extracted_data(raw_data):
         certs_list = []
         certs = data['certifications'] if isinstance(data['certifications'], list) else [data['certifications']]
         for cert in certs:
-            if isinstance(cert, str) and clean_text(cert):
-                certs_list.append(clean_text(cert))
+            if isinstance(cert, str):
+                clean_cert = clean_text(cert)
+                if clean_cert:
+                    certs_list.append(clean_cert)
         processed['certifications'] = certs_list
     
     return processed
 
+def parse_html(html_content):
+    """Parse HTML with selectolax when installed (10x+ faster on multi-MB profiles), else BeautifulSoup"""
+    if SELECTOLAX_AVAILABLE:
+        return LexborHTMLParser(html_content)
+    return BeautifulSoup(html_content, 'html.parser')
+
+def select_first_text(document, selector):
+    """Text of the first element matching selector, or None"""
+    if SELECTOLAX_AVAILABLE:
+        node = document.css_first(selector)
+        return node.text() if node is not None else None
+    element = document.select_one(selector)
+    return element.get_text() if element is not None else None
+
+def select_texts(document, selector):
+    """(element key, text) for every element matching selector - the key identifies elements across queries"""
+    if SELECTOLAX_AVAILABLE:
+        return [(node.mem_id, node.text()) for node in document.css(selector)]
+    return [(id(element), element.get_text()) for element in document.select(selector)]
+
 def manual_extraction_fallback(html_content):
-    """Enhanced manual extraction fallback using BeautifulSoup"""
-    if not BS4_AVAILABLE:
+    """Enhanced manual extraction fallback using selectolax or BeautifulSoup"""
+    if not (SELECTOLAX_AVAILABLE or BS4_AVAILABLE):
         return {
             'extraction_method': 'raw_html_fallback',
-            'note': 'Neither crawl4ai nor BeautifulSoup available - saved raw HTML only',
+            'note': 'Neither crawl4ai nor an HTML parser (selectolax/BeautifulSoup) available - saved raw HTML only',
             'html_length': len(html_content)
         }
     
-    soup = BeautifulSoup(html_content, 'html.parser')
+    document = parse_html(html_content)
     profile_data = {}
     
     # Enhanced name extraction
@@ -461,9 +503,9 @@ def manual_extraction_fallback(html_content):
     
     name = ""
     for selector in name_selectors:
-        element = soup.select_one(selector)
-        if element:
-            name = clean_text(element.get_text())
+        text = select_first_text(document, selector)
+        if text:
+            name = clean_text(text)
             if name:
                 break
     profile_data['name'] = name
@@ -478,9 +520,9 @@ def manual_extraction_fallback(html_content):
     
     headline = ""
     for selector in headline_selectors:
-        element = soup.select_one(selector)
-        if element:
-            headline = clean_text(element.get_text())
+        text = select_first_text(document, selector)
+        if text:
+            headline = clean_text(text)
             if headline and len(headline) > 10:
                 break
     profile_data['headline'] = headline
@@ -495,9 +537,8 @@ def manual_extraction_fallback(html_content):
     
     location = ""
     for selector in location_selectors:
-        elements = soup.select(selector)
-        for element in elements:
-            text = clean_text(element.get_text())
+        for _, raw_text in select_texts(document, selector):
+            text = clean_text(raw_text)
             if text and any(keyword in text.lower() for keyword in ['area', 'city', 'state', 'country', ',']):
                 location = text
                 break
@@ -514,9 +555,9 @@ def manual_extraction_fallback(html_content):
     
     about = ""
     for selector in about_selectors:
-        element = soup.select_one(selector)
-        if element:
-            about = clean_text(element.get_text())
+        text = select_first_text(document, selector)
+        if text:
+            about = clean_text(text)
             if about and len(about) > 20:
                 break
     profile_data['about'] = about
@@ -530,9 +571,8 @@ def manual_extraction_fallback(html_content):
     
     experiences = []
     for selector in experience_selectors:
-        elements = soup.select(selector)
-        for element in elements:
-            text = clean_text(element.get_text())
+        for _, raw_text in select_texts(document, selector):
+            text = clean_text(raw_text)
             if text and len(text) > 20:
                 parsed_exp = parse_experience_item(text)
                 if parsed_exp and parsed_exp.get('title'):
@@ -546,24 +586,21 @@ def manual_extraction_fallback(html_content):
         '.artdeco-list__item'
     ]
     
-    skills = []
+    # Selector priority is kept; an element matched by several selectors is cleaned once,
+    # and skills are deduped case-insensitively in the same pass
+    seen_elements = set()
+    unique_skills = {}
     for selector in skills_selectors:
-        elements = soup.select(selector)
-        for element in elements:
-            text = clean_text(element.get_text())
-            if text and len(text) < 100 and len(text) > 2:
-                skills.append(text)
-    
-    # Remove duplicates while preserving order
-    seen = set()
-    unique_skills = []
-    for skill in skills:
-        if skill.lower() not in seen:
-            seen.add(skill.lower())
-            unique_skills.append(skill)
-    
-    profile_data['skills'] = unique_skills[:20]
-    profile_data['extraction_method'] = 'enhanced_beautifulsoup'
+        for element_key, raw_text in select_texts(document, selector):
+            if element_key in seen_elements:
+                continue
+            seen_elements.add(element_key)
+            text = clean_text(raw_text)
+            if 2 < len(text) < 100:
+                unique_skills.setdefault(text.lower(), text)
+    
+    profile_data['skills'] = list(unique_skills.values())[:20]
+    profile_data['extraction_method'] = 'enhanced_selectolax' if SELECTOLAX_AVAILABLE else 'enhanced_beautifulsoup'
     
     return profile_data
 
@@ -617,7 +654,7 @@ async def scrape_linkedin_profile_enhanced(profile_url, manual_input=None):
         page = await ctx.new_page()
         
         try:
-            await page.goto(profile_url, timeout=30000)
+            await goto_linkedin(page, profile_url)
             
             if headless_mode:
                 await asyncio.sleep(5)
@@ -629,7 +666,7 @@ async def scrape_linkedin_profile_enhanced(profile_url, manual_input=None):
             # Handle authentication
             if "/login" in page.url or "/checkpoint" in page.url:
                 if await enhanced_tab_login(ctx, email, password):
-                    await page.goto(profile_url, timeout=30000)
+                    await goto_linkedin(page, profile_url)
                     await asyncio.sleep(3)
                 else:
                     raise RuntimeError("Login failed")
@@ -638,7 +675,7 @@ async def scrape_linkedin_profile_enhanced(profile_url, manual_input=None):
                     pass  # Already on the page
                 else:
                     if await enhanced_tab_login(ctx, email, password):
-                        await page.goto(profile_url, timeout=30000)
+                        await goto_linkedin(page, profile_url)
                         await asyncio.sleep(3)
                     else:
                         raise RuntimeError("All login methods failed")
@@ -649,9 +686,6 @@ async def scrape_linkedin_profile_enhanced(profile_url, manual_input=None):
                 raise RuntimeError("Still not authenticated after login attempts")
             
             await page.wait_for_selector("main", timeout=15000)
-            await close_banners_enhanced(page)
-            await asyncio.sleep(2)
-            
             await scroll_page_slowly(page)
             
             html = await page.content()
@@ -5,10 +5,12 @@ from urllib.parse import urlparse, parse_qs
 from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
 import requests
 from fake_useragent import UserAgent
+from job_scraper.http_client import async_linkedin_slot, get_session, linkedin_get
 
 class LinkedInScraperEnhanced:
-    def __init__(self):
+    def __init__(self, session: requests.Session = None):
         self.ua = UserAgent()
+        self.session = session or get_session()
         self.session_delays = [2, 3, 4, 5, 6]  # Random delays between requests
         
     def get_random_user_agent(self):
@@ -127,7 +129,9 @@ class LinkedInScraperEnhanced:
         crawl_config = self.get_human_like_crawl_config()
         
         async with AsyncWebCrawler(config=browser_config) as crawler:
-            result = await crawler.arun(url=url, config=crawl_config)
+            # Shares the LinkedIn rate limit with the company and profile fetches
+            async with async_linkedin_slot():
+                result = await crawler.arun(url=url, config=crawl_config)
             
             if result.success and len(result.markdown.strip()) > 200:
                 return {
@@ -169,8 +173,8 @@ class LinkedInScraperEnhanced:
         }
         
         try:
-            # Use requests for API calls (faster than browser)
-            response = requests.get(api_url, headers=headers, timeout=15)
+            # Use requests for API calls (faster than browser) - rate limited and run off the event loop
+            response = await asyncio.to_thread(linkedin_get, api_url, session=self.session, headers=headers, timeout=15)
             
             if response.status_code == 200:
                 return {
@@ -229,23 +233,23 @@ class LinkedInScraperEnhanced:
         return match.group(1) if match else None
 
 # Usage functions that replace your existing scrapers
-async def scrape_linkedin_job_enhanced(job_url: str) -> dict:
+async def scrape_linkedin_job_enhanced(job_url: str, session: requests.Session = None) -> dict:
     """Enhanced job scraping without account detection risk"""
-    scraper = LinkedInScraperEnhanced()
+    scraper = LinkedInScraperEnhanced(session)
     return await scraper.scrape_with_fallback(job_url, "job")
 
-async def scrape_linkedin_company_enhanced(company_url: str) -> dict:
+async def scrape_linkedin_company_enhanced(company_url: str, session: requests.Session = None) -> dict:
     """Enhanced company scraping without account detection risk"""
-    scraper = LinkedInScraperEnhanced()
+    scraper = LinkedInScraperEnhanced(session)
     return await scraper.scrape_with_fallback(company_url, "company")
 
-async def scrape_linkedin_recruiter_enhanced(recruiter_url: str) -> dict:
+async def scrape_linkedin_recruiter_enhanced(recruiter_url: str, session: requests.Session = None) -> dict:
     """Enhanced recruiter scraping without account detection risk"""
-    scraper = LinkedInScraperEnhanced()
+    scraper = LinkedInScraperEnhanced(session)
     return await scraper.scrape_with_fallback(recruiter_url, "recruiter")
 
 # Synchronous wrappers for compatibility
-def fetch_linkedin_job_enhanced(job_url: str, manual_job_text: str = None) -> dict:
+def fetch_linkedin_job_enhanced(job_url: str, manual_job_text: str = None, session: requests.Session = None) -> dict:
     """Drop-in replacement for your existing fetch_linkedin_job_sync"""
     if manual_job_text and manual_job_text.strip():
         # Handle manual input same as before
@@ -257,7 +261,7 @@ def fetch_linkedin_job_enhanced(job_url: str, manual_job_text: str = None) -> di
         }
     
     # Use enhanced scraping
-    result = asyncio.run(scrape_linkedin_job_enhanced(job_url))
+    result = asyncio.run(scrape_linkedin_job_enhanced(job_url, session))
     
     if result.get("success"):
         return {
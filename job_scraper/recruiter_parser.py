@@ -1,8 +1,9 @@
-from langchain_openai import ChatOpenAI
 from langchain.schema import SystemMessage, HumanMessage
 import json
-import re
-from config import settings
+from config import get_chat_model
+
+# Reused to pull the JSON object out of LLM output
+_JSON_DECODER = json.JSONDecoder()
 
 def parse_recruiter_profile(recruiter_markdown: str, model: str = "gpt-4o-mini") -> dict:
     """
@@ -10,11 +11,7 @@ def parse_recruiter_profile(recruiter_markdown: str, model: str = "gpt-4o-mini")
     -> name, position, company, location, specializations, experience, approach, etc.
     Uses OpenAI API key from config.py
     """
-    llm = ChatOpenAI(
-        openai_api_key=settings.OPENAI_API_KEY,
-        model=model,
-        temperature=0
-    )
+    llm = get_chat_model(model, cache_responses=False)  # Free-form reply, cleaned up below - not cached
     
     system_prompt = """You are an expert recruiter profile analyzer. Extract structured data from LinkedIn recruiter profiles. 
     Always return valid JSON without markdown formatting. Focus on professional recruiting context."""
@@ -53,7 +50,7 @@ Recruiter profile content:
     ]
     
     try:
-        response = llm(messages)
+        response = llm.invoke(messages)
         content = response.content.strip()
         
         # Remove markdown code blocks if present
@@ -127,21 +124,18 @@ def validate_recruiter_data(data: dict) -> dict:
 
 def clean_json_response(content: str) -> str:
     """
-    Clean JSON response by removing markdown code blocks and extra formatting
+    Extract the JSON object from an LLM response, skipping code fences and any text around it.
+    raw_decode parses from the first '{' and stops at the end of that object in one pass.
     """
-    # Remove markdown code blocks
-    content = re.sub(r'```json\s*', '', content)
-    content = re.sub(r'```\s*', '', content)
-    
-    # Remove any leading/trailing whitespace
-    content = content.strip()
-    
-    # If content starts with text before JSON, try to extract JSON
-    json_match = re.search(r'\{.*\}', content, re.DOTALL)
-    if json_match:
-        content = json_match.group(0)
-    
-    return content
+    start = content.find('{')
+    if start == -1:
+        return content.strip()
+    try:
+        _, end = _JSON_DECODER.raw_decode(content, start)
+    except json.JSONDecodeError:
+        # Not valid JSON - hand the candidate back so the caller's json.loads reports the error
+        return content[start:].strip()
+    return content[start:end]
 
 def enhance_recruiter_data_with_insights(recruiter_data: dict, job_context: dict = None) -> dict:
     """
@@ -5,6 +5,7 @@ import random
 from urllib.parse import urlparse
 from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
 from config import settings
+from job_scraper.http_client import async_linkedin_slot
 
 def get_random_user_agent():
     """Generate random user agents to avoid detection"""
@@ -80,10 +81,12 @@ async def scrape_linkedin_company(company_url: str) -> dict:
         await asyncio.sleep(random.uniform(1, 3))
         
         async with AsyncWebCrawler(config=browser_config) as crawler:
-            result = await crawler.arun(
-                url=company_url,
-                config=run_config
-            )
+            # Shares the LinkedIn rate limit with the job and profile fetches
+            async with async_linkedin_slot():
+                result = await crawler.arun(
+                    url=company_url,
+                    config=run_config
+                )
             
             if result.success:
                 print(f"✅ Successfully scraped company page")
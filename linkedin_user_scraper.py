@@ -368,7 +368,7 @@ LinkedIn profile content:
         ]
         
         print("🤖  Analyzing profile with LLM...")
-        response = llm(messages)
+        response = llm.invoke(messages)
         content = response.content.strip()
         
         # Remove markdown code blocks if present
@@ -397,20 +397,19 @@ LinkedIn profile content:
         }
 
 def clean_json_response(content: str) -> str:
-    """Clean JSON response by removing markdown code blocks and extra formatting"""
-    # Remove markdown code blocks
-    content = re.sub(r'```json\s*', '', content)
-    content = re.sub(r'```\s*', '', content)
-    
-    # Remove any leading/trailing whitespace
-    content = content.strip()
-    
-    # If content starts with text before JSON, try to extract JSON
-    json_match = re.search(r'\{.*\}', content, re.DOTALL)
-    if json_match:
-        content = json_match.group(0)
-    
-    return content
+    """
+    Extract the JSON object from an LLM response, skipping code fences and any text around it.
+    raw_decode parses from the first '{' and stops at the end of that object in one pass.
+    """
+    start = content.find('{')
+    if start == -1:
+        return content.strip()
+    try:
+        _, end = json.JSONDecoder().raw_decode(content, start)
+    except json.JSONDecodeError:
+        # Not valid JSON - hand the candidate back so the caller's json.loads reports the error
+        return content[start:].strip()
+    return content[start:end]
 
 def merge_extraction_results(basic_data: dict, llm_data: dict) -> dict:
     """
@@ -0,0 +1,92 @@
+from langchain.schema import SystemMessage, HumanMessage
+from config import get_chat_model
+from matching_engine.prompt_generator import analyze_rice_factors_llm
+from matching_engine.matcher import match_cv_to_job
+from concurrent.futures import ThreadPoolExecutor
+import json
+
+def generate_all(cv_dict: dict, job_dict: dict, company_context: str = "", recruiter_context: str = "", tone: str = "professional", model: str = "gpt-4o-mini") -> dict:
+    """
+    Produce the match analysis, cover letter and recruiter message for one CV/job pair.
+    The match is scored by its own deterministic call (match_cv_to_job, temperature 0), run
+    concurrently with the communications; the cover letter and message are batched into one
+    LLM call that returns {"cover_letter": "...", "message": "..."}.
+    If the communications call fails (or leaves either text out), the match is still returned and
+    the failure is reported under "error", so the caller does not cache the result.
+    """
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        match_future = executor.submit(match_cv_to_job, cv_dict, job_dict)
+        communications = _generate_communications(cv_dict, job_dict, company_context, recruiter_context, tone, model)
+        match = match_future.result()
+
+    if "error" in communications:
+        return {"match": match, "cover_letter": None, "message": None, "error": communications}
+    return {"match": match, **communications}
+
+def _generate_communications(cv_dict, job_dict, company_context, recruiter_context, tone, model):
+    """Write the cover letter and recruiter message in one call; returns them or an error dict"""
+    llm = get_chat_model(model, temperature=0.5, json_mode=True)  # Some variety keeps the letters natural
+
+    # RICE analysis is shared by both communications
+    rice_analysis = analyze_rice_factors_llm(cv_dict, job_dict, company_context, recruiter_context, model)
+
+    system_prompt = """You are a master of job application writing. You write communications using the RICE methodology (Reward, Ideology, Coercion, Ego) to connect with hiring managers and recruiters on a psychological level.
+
+You will answer two tasks about the same candidate and job in one response. Always return a single valid JSON object."""
+
+    user_prompt = f"""
+CANDIDATE PROFILE:
+{json.dumps(cv_dict, indent=2)}
+
+JOB POSITION:
+{json.dumps(job_dict, indent=2)}
+
+COMPANY CONTEXT:
+{company_context if company_context else "No specific company context available"}
+
+RECRUITER PROFILE & CONTEXT:
+{recruiter_context if recruiter_context else "No specific recruiter context available"}
+
+RICE PSYCHOLOGICAL ANALYSIS:
+{json.dumps(rice_analysis, indent=2)}
+
+[TASK1: cover_letter]
+Write a compelling cover letter.
+- Tone: {tone}
+- Length: 300-400 words
+- Structure: Hook opening, 2-3 body paragraphs, strong closing
+- Primary focus on the "{rice_analysis.get('primary_motivation', 'reward')}" motivation, with RICE factors woven in naturally
+- Include specific, quantifiable achievements that resonate with the identified motivations
+
+[TASK2: recruiter_message]
+Write a LinkedIn message to the recruiter.
+- Tone: {tone} but conversational
+- Length: 150-200 words
+- Address the recruiter by name if available and reference their specializations
+- Highlight 2-3 achievements that align with their RICE motivations
+- End with a clear but non-pushy call-to-action
+
+Respond with JSON using exactly these keys:
+{{
+    "cover_letter": "full cover letter text",
+    "message": "full recruiter message text"
+}}
+"""
+
+    messages = [
+        SystemMessage(content=system_prompt),
+        HumanMessage(content=user_prompt)
+    ]
+
+    try:
+        response = llm.invoke(messages)
+        txt = response.content.strip()
+        results = json.loads(txt)
+    except json.JSONDecodeError:
+        return {"error": "invalid-json", "raw": txt}
+    except Exception as e:
+        return {"error": "API call failed", "details": str(e)}
+
+    if not results.get("cover_letter") or not results.get("message"):
+        return {"error": "incomplete-response", "raw": txt}
+    return {"cover_letter": results["cover_letter"], "message": results["message"]}
@@ -1,18 +1,13 @@
-from langchain_openai import ChatOpenAI
 from langchain.schema import SystemMessage, HumanMessage
 import json
-from config import settings
+from config import get_chat_model
 
 def match_cv_to_job(cv_dict: dict, job_dict: dict, model: str = "gpt-4.1-mini") -> dict:
     """
     Leverage LLM to compare CV and job and return structured match info.
     Uses OpenAI API key from config.py
     """
-    llm = ChatOpenAI(
-        openai_api_key=settings.OPENAI_API_KEY,
-        model=model,
-        temperature=0
-    )
+    llm = get_chat_model(model, cache_responses=False)  # No JSON mode - a reply that fails to parse must not be cached
 
     system_prompt = "You are a helpful assistant for evaluating CV-job fit."
     
@@ -39,10 +34,30 @@ Job JSON:
     ]
     
     try:
-        response = llm(messages)
+        response = llm.invoke(messages)
         txt = response.content.strip()
         return json.loads(txt)
     except json.JSONDecodeError:
         return {"error": "invalid-json", "raw": txt}
     except Exception as e:
-        return {"error": "API call failed", "details": str(e)}
\ No newline at end of file
+        return {"error": "API call failed", "details": str(e)}
+
+def format_match_summary(match_results: dict) -> str:
+    """
+    Create a compact markdown summary of the match results
+    """
+    if match_results.get('error'):
+        return f"Error calculating match: {match_results.get('details') or match_results['error']}"
+    
+    summary = f"**Overall Match Score:** {match_results.get('overall_match_score', 'N/A')}/100\n"
+    
+    if match_results.get('summary'):
+        summary += f"\n{match_results['summary']}\n"
+    
+    if match_results.get('strengths'):
+        summary += "\n**Strengths:**\n" + "\n".join(f"- {item}" for item in match_results['strengths'][:5]) + "\n"
+    
+    if match_results.get('weaknesses'):
+        summary += "\n**Gaps:**\n" + "\n".join(f"- {item}" for item in match_results['weaknesses'][:5]) + "\n"
+    
+    return summary.strip()
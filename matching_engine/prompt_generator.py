@@ -1,17 +1,12 @@
-from langchain_openai import ChatOpenAI
 from langchain.schema import SystemMessage, HumanMessage
-from config import settings
+from config import get_chat_model
 import json
 
 def analyze_rice_factors_llm(cv_dict: dict, job_dict: dict, company_context: str = "", recruiter_context: str = "", model: str = "gpt-4o-mini") -> dict:
     """
     Use LLM to dynamically analyze RICE factors based on specific context
     """
-    llm = ChatOpenAI(
-        openai_api_key=settings.OPENAI_API_KEY,
-        model=model,
-        temperature=0.3  # Lower temperature for more consistent analysis
-    )
+    llm = get_chat_model(model, temperature=0.3)  # Lower temperature for more consistent analysis
 
     system_prompt = """You are an expert in human psychology and persuasion, specifically trained in the RICE methodology (Reward, Ideology, Coercion, Ego) used by intelligence agencies to understand and influence motivation.
 
@@ -63,7 +58,7 @@ Be specific to this context, not generic.
     ]
     
     try:
-        response = llm(messages)
+        response = llm.invoke(messages)
         content = response.content.strip()
         
         # Clean JSON response
@@ -89,11 +84,13 @@ def generate_cover_letter(cv_dict: dict, job_dict: dict, company_context: str =
     """
     Generate a RICE-optimized cover letter using LLM analysis
     """
-    llm = ChatOpenAI(
-        openai_api_key=settings.OPENAI_API_KEY,
-        model=model,
-        temperature=0.7
-    )
+    return "".join(stream_cover_letter(cv_dict, job_dict, company_context, tone, model)).strip()
+
+def stream_cover_letter(cv_dict: dict, job_dict: dict, company_context: str = "", tone: str = "professional", model: str = "gpt-4o-mini"):
+    """
+    Stream a RICE-optimized cover letter, yielding text chunks as the LLM produces them
+    """
+    llm = get_chat_model(model, temperature=0.7)
 
     # First, analyze RICE factors
     rice_analysis = analyze_rice_factors_llm(cv_dict, job_dict, company_context, "", model)
@@ -151,20 +148,22 @@ Make this feel personal, researched, and impossible to ignore. The hiring manage
     ]
     
     try:
-        response = llm(messages)
-        return response.content.strip()
+        for chunk in llm.stream(messages):
+            yield chunk.content
     except Exception as e:
-        return f"Error generating cover letter: {str(e)}"
+        yield f"Error generating cover letter: {str(e)}"
 
 def generate_message(cv_dict: dict, job_dict: dict, company_context: str = "", recruiter_context: str = "", tone: str = "professional", model: str = "gpt-4o-mini") -> str:
     """
     Generate a RICE-optimized recruiter message using enhanced recruiter data
     """
-    llm = ChatOpenAI(
-        openai_api_key=settings.OPENAI_API_KEY,
-        model=model,
-        temperature=0.7
-    )
+    return "".join(stream_message(cv_dict, job_dict, company_context, recruiter_context, tone, model)).strip()
+
+def stream_message(cv_dict: dict, job_dict: dict, company_context: str = "", recruiter_context: str = "", tone: str = "professional", model: str = "gpt-4o-mini"):
+    """
+    Stream a RICE-optimized recruiter message, yielding text chunks as the LLM produces them
+    """
+    llm = get_chat_model(model, temperature=0.7)
 
     # Analyze RICE factors including recruiter context
     rice_analysis = analyze_rice_factors_llm(cv_dict, job_dict, company_context, recruiter_context, model)
@@ -231,20 +230,16 @@ Make this feel like you've done your homework and genuinely want to work with TH
     ]
     
     try:
-        response = llm(messages)
-        return response.content.strip()
+        for chunk in llm.stream(messages):
+            yield chunk.content
     except Exception as e:
-        return f"Error generating message: {str(e)}"
+        yield f"Error generating message: {str(e)}"
 
 def generate_custom_prompt(cv_dict: dict, job_dict: dict, custom_request: str, company_context: str = "", recruiter_context: str = "", model: str = "gpt-4o-mini") -> str:
     """
     Generate custom content using RICE methodology for any user request
     """
-    llm = ChatOpenAI(
-        openai_api_key=settings.OPENAI_API_KEY,
-        model=model,
-        temperature=0.7
-    )
+    llm = get_chat_model(model, temperature=0.7)
 
     # Analyze RICE factors for context
     rice_analysis = analyze_rice_factors_llm(cv_dict, job_dict, company_context, recruiter_context, model)
@@ -288,7 +283,7 @@ Response:
     ]
     
     try:
-        response = llm(messages)
+        response = llm.invoke(messages)
         return response.content.strip()
     except Exception as e:
         return f"Error generating custom content: {str(e)}"
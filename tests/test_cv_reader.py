@@ -0,0 +1,43 @@
+import io
+import zipfile
+
+from cv_parser.cv_reader import read_cv
+
+
+def _docx_bytes(body_xml):
+    document = (
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+        ' xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006">'
+        f'<w:body>{body_xml}</w:body></w:document>'
+    )
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as docx:
+        docx.writestr("word/document.xml", document)
+    return buffer.getvalue()
+
+
+def test_read_docx_keeps_tabs():
+    data = _docx_bytes('<w:p><w:r><w:t>Engineer</w:t><w:tab/><w:t>2020</w:t></w:r></w:p>')
+
+    assert read_cv("cv.docx", data=data) == "Engineer\t2020"
+
+
+def test_read_docx_keeps_line_breaks():
+    data = _docx_bytes(
+        '<w:p><w:r><w:t>Acme Ltd</w:t><w:br/><w:t>Data Engineer</w:t><w:cr/><w:t>2019</w:t></w:r></w:p>'
+        '<w:p><w:r><w:t>Skills</w:t></w:r></w:p>'
+    )
+
+    assert read_cv("cv.docx", data=data) == "Acme Ltd\nData Engineer\n2019\nSkills"
+
+
+def test_read_docx_reads_text_box_once():
+    text_box = '<w:txbxContent><w:p><w:r><w:t>Contact: jane@example.com</w:t></w:r></w:p></w:txbxContent>'
+    data = _docx_bytes(
+        '<w:p><w:r><w:t>Jane Doe</w:t></w:r><w:r><mc:AlternateContent>'
+        f'<mc:Choice Requires="wps"><w:drawing>{text_box}</w:drawing></mc:Choice>'
+        f'<mc:Fallback><w:pict>{text_box}</w:pict></mc:Fallback>'
+        '</mc:AlternateContent></w:r></w:p>'
+    )
+
+    assert read_cv("cv.docx", data=data) == "Jane Doe\nContact: jane@example.com"
@@ -0,0 +1,19 @@
+import pytest
+
+pytest.importorskip("langchain")
+pytest.importorskip("dotenv")
+
+from cv_parser.cv_structurer import split_cv_text
+
+
+def test_split_cv_text_keeps_document_order_around_oversized_block():
+    cv_text = "A" * 10 + "\n\n" + "B" * 25 + "\n\n" + "C" * 5
+
+    parts = split_cv_text(cv_text, max_chars=20)
+
+    assert parts == ["A" * 10, "B" * 20, "B" * 5 + "\n\n" + "C" * 5]
+    assert "".join(parts).replace("\n\n", "") == "A" * 10 + "B" * 25 + "C" * 5
+
+
+def test_split_cv_text_returns_short_cv_whole():
+    assert split_cv_text("short cv", max_chars=20) == ["short cv"]